@@ -2,17 +2,108 @@
 Action selector - decides what MaxBitcoins does each run
 """
 
+import io
 import logging
+from contextlib import closing
+from functools import partial
 from datetime import datetime
+from string import Template
 from brain.config import Config
 from brain.revenue_tracker import RevenueTracker
 from brain.strategic_learnings import StrategicLearnings
 from brain.nostr_poster import NostrPoster
 from brain.blog_improver import BlogImprover
 from brain.email_sender import EmailSender
+from brain.jsonio import compact as _compact
+from brain.llm import CACHE_TEMPERATURE, ProviderError, _trim, token_budget
+from brain.llm_cache import LLMCache, cache_key
+from brain.oracle_cache import OracleCache, context_signature
+from brain.strategy_tuner import StrategyTuner
 
 logger = logging.getLogger(__name__)
 
+STRATEGIC_PROMPT = Template(
+    """You are MaxBitcoins Strategic Advisor. Your job is to figure out how to earn more Bitcoin.
+
+## Current State
+- Balance: $balance sats
+- Today's revenue: $daily_revenue sats
+- Total earned: $total_earned sats
+- Last action: $last_action
+
+## Recent History (last 20 runs)
+$history
+
+## Strategic Learnings (what worked/failed before)
+$learnings
+
+## Failed Action Counts
+$failed_counts
+
+## Your Task
+Analyze the situation and tell me EXACTLY what to do right now to earn more Bitcoin.
+
+You have full access to:
+- Nostr posting (beeminder can zap)
+- Blog improvement  
+- Email outreach
+- Browser for discovery
+- Full codebase at /home/klabo/code/maxbitcoins/
+- Execute shell commands
+
+Be creative. Think about what's actually worked in the past. Look for new opportunities.
+If there's nothing good to do, say "monitor" and explain why.
+
+Give me a specific action to take right now. Not a plan - an action."""
+)
+
+
+EXECUTION_SYSTEM = """You are MaxBitcoins execution engine. You have full control to take ANY action to earn Bitcoin. 
+
+You have access to:
+- Nostr posting
+- Blog improvement
+- Email outreach  
+- Browser for discovery
+- Full codebase at /home/klabo/code/maxbitcoins/
+- Execute shell commands with subprocess
+
+Execute the suggestion. If it requires code changes, make them. If it requires posting somewhere, do it.
+Just get it done and report what you did in detail.
+When finished, write END_OF_REPORT on its own line."""
+
+REPORT_END = "END_OF_REPORT"
+REPORT_MAX_CHARS = 4000
+
+
+HISTORY_PROMPT_CHARS = 4000
+LEARNINGS_PROMPT_CHARS = 2000
+
+
+def _earning_well() -> str:
+    return "earning_well"
+
+
+def _no_action_needed() -> str:
+    return "no_action_needed"
+
+
+def _pack_under_budget(entries: list, max_chars: int) -> str:
+    """Keep the newest entries whose compact JSON fits in max_chars, oldest first.
+
+    Long strings (e.g. a full execution report) are cut down first so one
+    big entry can't crowd out everything before it.
+    """
+    kept = []
+    used = 2  # the surrounding brackets
+    for entry in reversed(entries):
+        encoded = _compact(_trim(entry))
+        if used + len(encoded) + 1 > max_chars:
+            break
+        kept.append(encoded)
+        used += len(encoded) + 1
+    return "[" + ",".join(reversed(kept)) + "]"
+
 
 class ActionSelector:
     def __init__(
@@ -31,10 +122,67 @@ class ActionSelector:
         self.email = email
         self.llm = llm
         self.learnings = StrategicLearnings(config)
+        # A repeated suggestion is answered from cache for about one run
+        self.cache = LLMCache(ttl=config.run_interval_minutes * 60)
+        # Advice stays valid for about one more run if nothing has moved
+        self.oracle_cache = OracleCache(ttl=config.run_interval_minutes * 60 * 2)
+        self._tick_snapshot = None
+        self._rate_cache = {}
+
+        # Oracle verbs that map straight onto a built-in action
+        self._oracle_dispatch = {
+            "nostr_post": self._handle_nostr_suggestion,
+            "blog_improve": self._handle_blog_suggestion,
+            "email_outreach": self._handle_email_suggestion,
+        }
+
+        # strategic: oracle/LLM decides; rules: built-in actions only, no LLM;
+        # auto: pick whichever has been earning more
+        self._strategies = {
+            "rules": self._select_rules,
+            "strategic": self._select_strategic,
+        }
+        self.strategy = config.action_strategy
+        self.tuner = None
+        if self.strategy == "auto":
+            self.tuner = StrategyTuner(list(self._strategies))
+            self._select = self._select_auto
+        else:
+            if self.strategy not in self._strategies:
+                logger.warning(
+                    f"Unknown action strategy {self.strategy!r}, using strategic"
+                )
+                self.strategy = "strategic"
+            self._select = self._strategies[self.strategy]
+
+    def begin_tick(self, stats: dict, balance: int, history: list):
+        """Pin this run's stats/balance/history so decisions don't re-read them"""
+        self._tick_snapshot = {"stats": stats, "balance": balance, "history": history}
+        if self.tuner:
+            self.tuner.credit(balance)
+
+    def end_tick(self):
+        """Drop the per-run snapshot"""
+        self._tick_snapshot = None
+
+    def _stats(self) -> dict:
+        if self._tick_snapshot is not None:
+            return self._tick_snapshot["stats"]
+        return self.revenue.get_stats()
+
+    def _balance(self) -> int:
+        if self._tick_snapshot is not None:
+            return self._tick_snapshot["balance"]
+        return self.revenue.get_balance()
+
+    def _history(self) -> list:
+        if self._tick_snapshot is not None:
+            return self._tick_snapshot["history"]
+        return self.revenue.load_recent(20)
 
     def should_act(self) -> bool:
         """Decide if we should take an action"""
-        stats = self.revenue.get_stats()
+        stats = self._stats()
         daily_revenue = stats.get("daily_revenue", 0)
 
         # If we're earning, don't disrupt
@@ -46,7 +194,37 @@ class ActionSelector:
         return True
 
     def select_action(self) -> dict:
-        """Select the best action to take - give full context to LLM and let it decide"""
+        """Select the best action to take using the configured strategy"""
+        self._rate_cache = {}
+
+        # Earning already - don't spend an LLM round-trip deciding to do nothing
+        if not self.should_act():
+            return {"action": "monitor", "execute": _earning_well}
+
+        return self._select()
+
+    def _select_auto(self) -> dict:
+        """Let the tuner choose the strategy for this run"""
+        return self._strategies[self.tuner.choose(self._balance())]()
+
+    def _select_rules(self) -> dict:
+        """Pick the first built-in action that isn't failing or rate limited"""
+        failed = self._failed_counts()
+        for name, handler in (
+            ("nostr", self._handle_nostr_suggestion),
+            ("blog", self._handle_blog_suggestion),
+            ("email", self._handle_email_suggestion),
+        ):
+            if failed[name] < 2:
+                plan = handler()
+                if plan:
+                    return plan
+
+        logger.info("No built-in action available - monitoring")
+        return {"action": "monitor", "execute": _no_action_needed}
+
+    def _select_strategic(self) -> dict:
+        """Give full context to the oracle/LLM and let it decide"""
         logger.info(f"Oracle enabled: {self.config.use_oracle}")
 
         # Build full context
@@ -57,16 +235,30 @@ class ActionSelector:
 
         # If oracle is enabled, ask it first, then give its response to MiniMax
         if self.config.use_oracle:
-            logger.info("Asking Oracle for strategic advice...")
-            oracle_suggestion = self.llm.ask_oracle(context)
+            signature = context_signature(context)
+            oracle_suggestion = self.oracle_cache.get(signature)
+            if oracle_suggestion:
+                logger.info("Situation unchanged - reusing recent Oracle advice")
+            else:
+                logger.info("Asking Oracle for strategic advice...")
+                oracle_suggestion = self.llm.ask_oracle(context)
+                # "browser_discover" is ask_oracle's give-up answer, not advice
+                if oracle_suggestion and oracle_suggestion != "browser_discover":
+                    self.oracle_cache.set(signature, oracle_suggestion)
 
             if oracle_suggestion:
-                logger.info(f"Oracle strategic analysis: {oracle_suggestion[:500]}...")
+                logger.info("Oracle strategic analysis: %s...", oracle_suggestion[:500])
+
+                # Known verb - run the built-in action if its rate limit allows
+                handler = self._oracle_dispatch.get(oracle_suggestion.strip().lower())
+                plan = handler() if handler else None
+                if plan:
+                    return plan
 
                 # Give Oracle's analysis to MiniMax to execute
                 return {
                     "action": "oracle_execution",
-                    "execute": lambda: self._execute_suggestion(oracle_suggestion),
+                    "execute": partial(self._execute_suggestion, oracle_suggestion),
                     "oracle_suggestion": oracle_suggestion,
                 }
 
@@ -74,88 +266,146 @@ class ActionSelector:
         logger.info("No Oracle - asking MiniMax directly what to do...")
         return {
             "action": "llm_decision",
-            "execute": lambda: self._execute_suggestion(prompt),
+            "execute": partial(self._execute_suggestion, prompt),
             "prompt": prompt,
         }
 
+    def _rate_allows(self, name: str, check) -> bool:
+        """Rate-limit check memoized for the current select_action call"""
+        if name not in self._rate_cache:
+            self._rate_cache[name] = check()
+        return self._rate_cache[name]
+
+    def _can_post_nostr(self) -> bool:
+        return self._rate_allows("nostr", self.nostr.can_post)
+
+    def _can_post_blog(self) -> bool:
+        return self._rate_allows("blog", self.blog.can_post)
+
+    def _can_send_email(self) -> bool:
+        return self._rate_allows("email", self.email.can_send)
+
+    def _failed_counts(self) -> dict:
+        """Consecutive failure counters for each built-in channel"""
+        return {
+            "nostr": self.nostr.get_failed_count(),
+            "blog": self.blog.get_failed_count(),
+            "email": self.email.get_failed_count(),
+        }
+
+    def _handle_nostr_suggestion(self):
+        if not self._can_post_nostr():
+            return None
+        return {"action": "nostr_post", "execute": self._do_nostr_post}
+
+    def _handle_blog_suggestion(self):
+        if not self._can_post_blog():
+            return None
+        return {"action": "blog_improve", "execute": self._do_blog_improve}
+
+    def _handle_email_suggestion(self):
+        if not self._can_send_email():
+            return None
+        lead = self.email.get_next_lead()
+        if not lead:
+            return None
+        return {"action": "email_outreach", "execute": partial(self._do_email, lead)}
+
+    def _do_nostr_post(self) -> dict:
+        """Post a curated note to Nostr"""
+        content = self.nostr.generate_content(self.llm)
+        success = self.nostr.post_note(content)
+        self.nostr.record_post(success)
+        return {"result": "posted" if success else "failed", "content": content}
+
+    def _do_blog_improve(self) -> dict:
+        """Run the blog improvement action"""
+        return self.blog.improve_blog()
+
+    def _do_email(self, lead: dict) -> dict:
+        """Send outreach email to a warm lead"""
+        return self.email.send_email(lead, self.llm)
+
     def _build_context(self) -> dict:
         """Build full context for strategic decisions"""
-        history = self.revenue.load_history()
-        stats = self.revenue.get_stats()
+        history = self._history()
+        stats = self._stats()
 
         return {
-            "balance": self.revenue.get_balance(),
+            "balance": self._balance(),
             "daily_revenue": stats.get("daily_revenue", 0),
             "total_earned": stats.get("total_earned", 0),
             "last_action": stats.get("last_action", "none"),
-            "history": history[-20:],  # Last 20 runs
+            "history": history,  # Last 20 runs
             "learnings": self.learnings.get_recent(10),
-            "failed_counts": {
-                "nostr": self.nostr.get_failed_count(),
-                "blog": self.blog.get_failed_count(),
-                "email": self.email.get_failed_count(),
-            },
+            "failed_counts": self._failed_counts(),
         }
 
     def _build_strategic_prompt(self, context: dict) -> str:
         """Build the strategic prompt with full context"""
-        import json
-
-        return f"""You are MaxBitcoins Strategic Advisor. Your job is to figure out how to earn more Bitcoin.
-
-## Current State
-- Balance: {context.get("balance", 0)} sats
-- Today's revenue: {context.get("daily_revenue", 0)} sats
-- Total earned: {context.get("total_earned", 0)} sats
-- Last action: {context.get("last_action", "none")}
-
-## Recent History (last 20 runs)
-{json.dumps(context.get("history", []), indent=2)}
-
-## Strategic Learnings (what worked/failed before)
-{json.dumps(context.get("learnings", []), indent=2)}
-
-## Failed Action Counts
-{json.dumps(context.get("failed_counts", {}), indent=2)}
-
-## Your Task
-Analyze the situation and tell me EXACTLY what to do right now to earn more Bitcoin.
-
-You have full access to:
-- Nostr posting (beeminder can zap)
-- Blog improvement  
-- Email outreach
-- Browser for discovery
-- Full codebase at /home/klabo/code/maxbitcoins/
-- Execute shell commands
-
-Be creative. Think about what's actually worked in the past. Look for new opportunities.
-If there's nothing good to do, say "monitor" and explain why.
-
-Give me a specific action to take right now. Not a plan - an action."""
+        return STRATEGIC_PROMPT.substitute(
+            balance=context.get("balance", 0),
+            daily_revenue=context.get("daily_revenue", 0),
+            total_earned=context.get("total_earned", 0),
+            last_action=context.get("last_action", "none"),
+            history=_pack_under_budget(
+                context.get("history", []), HISTORY_PROMPT_CHARS
+            ),
+            learnings=_pack_under_budget(
+                context.get("learnings", []), LEARNINGS_PROMPT_CHARS
+            ),
+            failed_counts=_compact(context.get("failed_counts", {})),
+        )
+
+    def _execution_key(self, suggestion: str) -> str:
+        return cache_key(
+            provider=self.llm.provider_name(),
+            model=getattr(self.llm.current_provider, "model", None),
+            system=EXECUTION_SYSTEM,
+            prompt=suggestion,
+            max_tokens=token_budget("execution_report"),
+        )
 
     def _execute_suggestion(self, suggestion: str) -> dict:
         """Execute whatever the LLM suggests"""
-        logger.info(f"Executing suggestion: {suggestion[:200]}...")
-
-        system = """You are MaxBitcoins execution engine. You have full control to take ANY action to earn Bitcoin. 
-
-You have access to:
-- Nostr posting
-- Blog improvement
-- Email outreach  
-- Browser for discovery
-- Full codebase at /home/klabo/code/maxbitcoins/
-- Execute shell commands with subprocess
-
-Execute the suggestion. If it requires code changes, make them. If it requires posting somewhere, do it.
-Just get it done and report what you did in detail."""
-
-        result = self.llm.generate(suggestion, system=system, max_tokens=2000)
+        logger.info("Executing suggestion: %s...", suggestion[:200])
+
+        cached = self.cache.get(self._execution_key(suggestion))
+        if cached:
+            logger.info("Reusing cached execution result")
+            return cached
+
+        # Stream the report and stop at the end marker instead of waiting for
+        # the full token budget
+        report = io.StringIO()
+        stream = self.llm.generate_stream(
+            suggestion,
+            system=EXECUTION_SYSTEM,
+            stop=[REPORT_END],
+            intent="execution_report",
+            temperature=CACHE_TEMPERATURE,
+        )
+        try:
+            with closing(stream):
+                tail = ""
+                for chunk in stream:
+                    report.write(chunk)
+                    # The marker can straddle two chunks
+                    tail = (tail + chunk)[-(len(chunk) + len(REPORT_END)) :]
+                    if REPORT_END in tail or report.tell() > REPORT_MAX_CHARS:
+                        break
+        except ProviderError as e:
+            # Cut off mid-report - don't pass off (or cache) the fragment
+            logger.error(f"Execution report interrupted: {e}")
+            return {"result": "failed", "reason": "llm_interrupted"}
+        result = report.getvalue().split(REPORT_END, 1)[0].strip()
 
         if result:
-            logger.info(f"Execution result: {result[:500]}...")
-            return {"result": "executed", "output": result}
+            logger.info("Execution result: %s...", result[:500])
+            outcome = {"result": "executed", "output": result}
+            # Keyed on whichever provider answered, in case the call fell back
+            self.cache.set(self._execution_key(suggestion), outcome)
+            return outcome
         else:
             logger.error("LLM failed to execute")
             return {"result": "failed", "reason": "llm_failed"}
@@ -3,13 +3,15 @@ Main agent loop for MaxBitcoins
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 
 from brain.config import Config
 from brain.wallet import Wallet
 from brain.services import ServiceManager
 from brain.llm import LLM
-from brain.discovery import Discovery
 from brain.revenue_tracker import RevenueTracker
 from brain.strategic_learnings import StrategicLearnings
 from brain.nostr_poster import NostrPoster
@@ -19,6 +21,54 @@ from brain.action_selector import ActionSelector
 
 logger = logging.getLogger(__name__)
 
+LOG_FLUSH_SECONDS = 5  # longest a buffered INFO record waits before being written
+
+
+class BufferedHandler(logging.Handler):
+    """Holds log records for the duration of a run and writes them out in one go.
+
+    Warnings and errors are forwarded immediately, and anything older than
+    LOG_FLUSH_SECONDS goes out with the next record, so the journal never
+    falls far behind and a killed run loses little.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.targets = []
+        self.flushed_at = time.monotonic()
+
+    def install(self):
+        """Swap in for the root logger's handlers"""
+        root = logging.getLogger()
+        self.targets = root.handlers[:]
+        root.handlers = [self]
+        return self
+
+    def uninstall(self):
+        """Restore the original handlers and write out anything still buffered"""
+        root = logging.getLogger()
+        root.handlers = self.targets
+        self.flush()
+
+    def emit(self, record):
+        self.records.append(record)
+        if (
+            record.levelno >= logging.WARNING
+            or time.monotonic() - self.flushed_at >= LOG_FLUSH_SECONDS
+        ):
+            self.flush()
+
+    def flush(self):
+        self.flushed_at = time.monotonic()
+        records, self.records = self.records, []
+        for record in records:
+            for target in self.targets:
+                if record.levelno >= target.level:
+                    target.handle(record)
+        for target in self.targets:
+            target.flush()
+
 
 class Agent:
     def __init__(self, config: Config, wallet: Wallet, services: ServiceManager):
@@ -26,7 +76,6 @@ class Agent:
         self.wallet = wallet
         self.services = services
         self.llm = LLM(config)
-        self.discovery = Discovery(config)
 
         # Initialize components
         self.revenue = RevenueTracker(config)
@@ -38,7 +87,18 @@ class Agent:
             config, self.revenue, self.nostr, self.blog, self.email, self.llm
         )
 
-    def check_passive_income(self) -> dict:
+        # Actions run in the background; outcomes are recorded when they finish
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._pending = []
+
+    @cached_property
+    def discovery(self):
+        """External opportunity discovery - not needed on a normal run, so built on first use"""
+        from brain.discovery import Discovery
+
+        return Discovery(self.config)
+
+    def check_passive_income(self, health: dict) -> dict:
         """Step 1: Check passive income from owned services"""
         logger.info("Checking passive income...")
 
@@ -48,9 +108,6 @@ class Agent:
         # Get stats
         stats = self.revenue.get_stats()
 
-        # Check services
-        health = self.services.check_all()
-
         result = {
             "balance": balance,
             "stats": stats,
@@ -62,7 +119,7 @@ class Agent:
         )
         return result
 
-    def maintain_infrastructure(self) -> dict:
+    def maintain_infrastructure(self, health: dict) -> dict:
         """Step 2: Maintain owned services"""
         logger.info("Maintaining infrastructure...")
 
@@ -80,9 +137,6 @@ class Agent:
                     models = provider.list_models()
                     logger.info(f"Ollama models: {models}")
 
-        # Check services
-        health = self.services.check_all()
-
         # Check blog tips
         blog_status = self.blog.check_tips_working()
 
@@ -97,12 +151,12 @@ class Agent:
         """Step 3: Take one action if appropriate"""
         logger.info("Deciding on action...")
 
-        # Check if we should act
-        if not self.action_selector.should_act():
-            logger.info("No action needed - monitoring only")
-            return {"action": "monitor", "result": "earning_well"}
+        # Don't start a second action while the previous one is still running
+        if self._pending:
+            logger.info("Previous action still running - monitoring only")
+            return {"action": "monitor", "result": "action_in_progress"}
 
-        # Select action
+        # Select action (monitor-only when we're already earning)
         action_plan = self.action_selector.select_action()
 
         action_type = action_plan.get("action", "none")
@@ -111,12 +165,49 @@ class Agent:
         # Execute action
         execute_fn = action_plan.get("execute")
         if execute_fn:
-            result = execute_fn()
-            logger.info(f"Action result: {result}")
-            return {"action": action_type, "result": result}
+            if action_type == "monitor":
+                result = execute_fn()
+                logger.info("Action result: %s", result)
+                return {"action": action_type, "result": result}
+
+            future = self._executor.submit(execute_fn)
+            self._pending.append((action_type, future))
+            logger.info(f"Scheduled action: {action_type}")
+            return {"action": action_type, "result": "scheduled"}
 
         return {"action": "none", "result": "no_execute_fn"}
 
+    def _reap_pending(self, wait: bool = False):
+        """Record outcomes of background actions that have finished"""
+        still_running = []
+        for action_type, future in self._pending:
+            if not wait and not future.done():
+                still_running.append((action_type, future))
+                continue
+
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Action {action_type} failed: {e}")
+                result = {"result": "failed", "reason": str(e)}
+
+            logger.info("Action result: %s", result)
+            balance = self.wallet.get_balance()
+            ts = datetime.now().isoformat(timespec="seconds")
+            self.revenue.record_run(balance, action_type, str(result), ts=ts)
+            learning = f"Action '{action_type}' resulted in: {result}"
+            self.learnings.add(learning, context=f"balance={balance}", ts=ts)
+
+            # Send Nostr notification now that the real outcome is known
+            self.nostr.notify(balance, action_type, str(result))
+
+        self._pending = still_running
+
+    def drain(self):
+        """Wait for background actions and record their outcomes"""
+        self._reap_pending(wait=True)
+        self.nostr.flush()
+
     def reflect(self, income: dict, maintenance: dict, action: dict) -> dict:
         """Step 4: Reflect and record"""
         logger.info("Reflecting...")
@@ -125,11 +216,13 @@ class Agent:
         action_type = action.get("action", "")
         result = action.get("result", "")
 
-        # Record this run
-        self.revenue.record_run(balance, action_type, str(result))
+        # Record this run (scheduled actions are recorded and learned from
+        # once they finish, so they get a single history row)
+        if result != "scheduled":
+            self.revenue.record_run(balance, action_type, str(result))
 
         # Extract and save any learning from this action
-        if action_type != "monitor":
+        if action_type != "monitor" and result != "scheduled":
             learning = f"Action '{action_type}' resulted in: {result}"
             self.learnings.add(learning, context=f"balance={balance}")
 
@@ -142,31 +235,59 @@ class Agent:
 
     def run(self) -> dict:
         """Main agent loop"""
+        self._log_buffer = BufferedHandler().install()
+        try:
+            return self._run()
+        finally:
+            self._log_buffer.uninstall()
+
+    def _run(self) -> dict:
         logger.info("=" * 50)
         logger.info("Starting MaxBitcoins run...")
 
-        # Step 1: Check passive income
-        income = self.check_passive_income()
+        # Pick up outcomes of actions scheduled on earlier runs
+        self._reap_pending()
+
+        # Service health feeds both steps - probe the endpoints once
+        health = self.services.check_all()
+
+        # Steps 1 and 2 are independent I/O - run them side by side
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            # Step 1: Check passive income
+            income_future = pool.submit(self.check_passive_income, health)
 
-        # Step 2: Maintain infrastructure
-        maintenance = self.maintain_infrastructure()
+            # Step 2: Maintain infrastructure
+            maintenance_future = pool.submit(self.maintain_infrastructure, health)
 
-        # Step 3: Take action
-        action = self.take_action()
+            income = income_future.result()
+            maintenance = maintenance_future.result()
+
+        # Step 3: Take action (decisions reuse the stats gathered in step 1).
+        # Write out what we have first - the oracle call can block for a long time
+        self._log_buffer.flush()
+        self.action_selector.begin_tick(
+            income["stats"], income["balance"], self.revenue.load_recent(20)
+        )
+        try:
+            action = self.take_action()
+        finally:
+            self.action_selector.end_tick()
 
         # Step 4: Reflect
         result = self.reflect(income, maintenance, action)
+        self._log_buffer.flush()
 
         logger.info(
             f"Run complete: balance={result['balance']}, action={result['action_taken']}"
         )
         logger.info("=" * 50)
 
-        # Send Nostr notification
-        self.nostr.notify(
-            result["balance"],
-            result["action_taken"],
-            str(result.get("result", "")),
-        )
+        # Send Nostr notification (scheduled actions notify when they finish)
+        if result["result"] != "scheduled":
+            self.nostr.notify(
+                result["balance"],
+                result["action_taken"],
+                str(result.get("result", "")),
+            )
 
         return result
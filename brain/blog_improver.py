@@ -3,17 +3,80 @@ Blog improvement for MaxBitcoins
 """
 
 import logging
-import requests
-from datetime import datetime
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import json
+from string import Template
+from brain import jsonio
 from brain.config import Config
+from brain.http_client import new_session
 from brain.llm import LLM
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+_SESSION = new_session()
+
+TOPICS = (
+    "How to use the Web of Trust API for sybil resistance",
+    "Building Lightning-powered services with NWC",
+    "Getting started with Nostr NIP-05 verification",
+    "Running a Bitcoin API with L402 payments",
+    "Creating a Nostr DVM from scratch",
+)
+
+ARTICLE_PROMPT = Template("""Write a helpful, technical blog article about: $topic
+
+Include:
+- Brief introduction (2-3 sentences)
+- Main content with code examples where relevant  
+- Conclusion with next steps
+
+Keep it informative but not too long. This is for Bitcoin/Lightning developers.
+
+Format your reply exactly as:
+TITLE: <catchy title, one line>
+CONTENT:
+<article>""")
+
+TITLE_MAX_CHARS = 100
+ARTICLE_RE = re.compile(r"TITLE:\s*(.+?)\n+CONTENT:\s*(.*)", re.S)
+
+# Simple check - look for lightning-related elements near the top of the page
+TIP_MARKERS = (b"lnurl", b"lightning")
+TIP_SCAN_BYTES = 1024 * 1024
+
+
+def _page_mentions(resp, needles: tuple) -> bool:
+    """Scan a streamed body case-insensitively, stopping at the first match"""
+    overlap = max(len(n) for n in needles) - 1
+    tail = b""
+    scanned = 0
+    for chunk in resp.iter_content(16384):
+        window = tail + chunk.lower()
+        if any(n in window for n in needles):
+            return True
+        tail = window[-overlap:]
+        scanned += len(chunk)
+        if scanned >= TIP_SCAN_BYTES:
+            break
+    return False
+
+
+def _split_article(text: str) -> tuple:
+    """Split a TITLE:/CONTENT: reply, falling back to first line as the title"""
+    match = ARTICLE_RE.match(text.strip())
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+
+    lines = text.strip().split("\n", 1)
+    title = lines[0].replace("TITLE:", "").strip() if lines else ""
+    content = lines[1].replace("CONTENT:", "", 1).strip() if len(lines) > 1 else text
+    return title, content
+
 
 class BlogImprover:
     def __init__(self, config: Config, llm: LLM = None):
@@ -33,28 +96,35 @@ class BlogImprover:
         """Load blog improvement state"""
         if self.state_file.exists():
             try:
-                self.state = json.loads(self.state_file.read_text())
+                self.state = jsonio.loads(self.state_file.read_bytes())
             except:
                 self.state = {
                     "posts_this_week": 0,
-                    "last_post_date": "",
+                    "last_post_week": 0,
                     "failed_count": 0,
                 }
         else:
-            self.state = {"posts_this_week": 0, "last_post_date": "", "failed_count": 0}
+            self.state = {"posts_this_week": 0, "last_post_week": 0, "failed_count": 0}
+
+        self._dirty = False
 
     def _save_state(self):
-        """Save blog state"""
-        self.state_file.write_text(json.dumps(self.state, indent=2))
+        """Save blog state (only if something changed)"""
+        if not self._dirty:
+            return
+        tmp = self.state_file.with_suffix(".tmp")
+        tmp.write_bytes(jsonio.encode(self.state))
+        tmp.replace(self.state_file)
+        self._dirty = False
 
     def _reset_weekly(self):
         """Reset weekly counter"""
-        # Simple reset - could be smarter
-        today = datetime.now().date().isoformat()
-        if self.state.get("last_post_date", "").startswith(today[:7]):
-            return  # Same month
+        week = int(time.time()) // 86400 // 7  # UTC week index
+        if self.state.get("last_post_week") == week:
+            return
         self.state["posts_this_week"] = 0
-        self._save_state()
+        self.state["last_post_week"] = week
+        self._dirty = True
 
     def can_post(self) -> bool:
         """Check if we can post this week"""
@@ -73,59 +143,39 @@ class BlogImprover:
             self.state["failed_count"] = 0
         else:
             self.state["failed_count"] = self.state.get("failed_count", 0) + 1
+        self._dirty = True
         self._save_state()
 
     def check_tips_working(self) -> dict:
         """Check if Lightning tips are working on blogs"""
-        results = {}
-        for blog in self.blogs:
-            try:
-                resp = requests.get(blog["url"], timeout=10)
-                # Simple check - look for lightning-related elements
-                has_lnurl = (
-                    "lnurl" in resp.text.lower() or "lightning" in resp.text.lower()
-                )
-                results[blog["name"]] = {
+        with ThreadPoolExecutor(max_workers=len(self.blogs)) as pool:
+            statuses = pool.map(self._check_tips, self.blogs)
+            return {blog["name"]: status for blog, status in zip(self.blogs, statuses)}
+
+    def _check_tips(self, blog: dict) -> dict:
+        try:
+            with _SESSION.get(blog["url"], timeout=10, stream=True) as resp:
+                return {
                     "up": resp.status_code == 200,
-                    "has_tips": has_lnurl,
+                    "has_tips": _page_mentions(resp, TIP_MARKERS),
                 }
-            except Exception as e:
-                results[blog["name"]] = {"up": False, "error": str(e)}
-        return results
+        except Exception as e:
+            return {"up": False, "error": str(e)}
 
     def generate_article(self) -> dict:
         """Generate a blog article using LLM"""
         if not self.llm:
             return {"title": "", "content": "", "topic": "none"}
 
-        topics = [
-            "How to use the Web of Trust API for sybil resistance",
-            "Building Lightning-powered services with NWC",
-            "Getting started with Nostr NIP-05 verification",
-            "Running a Bitcoin API with L402 payments",
-            "Creating a Nostr DVM from scratch",
-        ]
-
-        import random
-
-        topic = random.choice(topics)
-
-        title_prompt = f"Create a catchy title for a blog article about: {topic}"
-        title = self.llm.generate(title_prompt, max_tokens=100)
-
-        content_prompt = f"""Write a helpful, technical blog article about: {topic}
-
-Include:
-- Brief introduction (2-3 sentences)
-- Main content with code examples where relevant  
-- Conclusion with next steps
-
-Keep it informative but not too long. This is for Bitcoin/Lightning developers."""
+        topic = random.choice(TOPICS)
+        prompt = ARTICLE_PROMPT.substitute(topic=topic)
 
-        content = self.llm.generate(content_prompt, max_tokens=1500)
+        # Not cached: the prompt only varies by topic, and each post should be new
+        text = self.llm.generate(prompt, intent="article")
+        title, content = _split_article(text)
 
         return {
-            "title": title[:100],
+            "title": title[:TITLE_MAX_CHARS],
             "content": content,
             "topic": topic,
         }
@@ -3,9 +3,14 @@ Browser-based opportunity discovery for MaxBitcoins
 Uses agent-browser to find real-time opportunities on various platforms
 """
 
+import contextvars
 import json
 import logging
+import random
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from brain.config import Config
 
@@ -13,6 +18,44 @@ logger = logging.getLogger(__name__)
 
 AGENT_BROWSER = "/home/klabo/.local/bin/agent-browser"
 
+# agent-browser keeps a warm browser per named session in its background daemon;
+# each platform check gets its own so parallel checks don't share one page
+_SESSION = contextvars.ContextVar("agent_browser_session", default=None)
+
+# Cap concurrent agent-browser processes, and start discovery at a random
+# offset so agents scheduled on the same interval don't hit it in lockstep
+MAX_BROWSER_PROCS = 2
+START_JITTER_SECONDS = 5
+_BROWSER_SEM = threading.Semaphore(MAX_BROWSER_PROCS)
+
+AVAILABILITY_TTL = 60  # seconds
+_AVAIL_CACHE = {"ok": None, "ts": 0.0}
+
+DISCOVERY_TTL = 300  # seconds a crawl stays fresh for repeat oracle calls
+_DISCOVERY_CACHE = {"result": None, "ts": 0.0}
+
+
+def _agent_browser_available() -> bool:
+    """Whether agent-browser runs, re-probed at most once per AVAILABILITY_TTL"""
+    now = time.monotonic()
+    fresh = now - _AVAIL_CACHE["ts"] < AVAILABILITY_TTL
+    if _AVAIL_CACHE["ok"] is not None and fresh:
+        return _AVAIL_CACHE["ok"]
+
+    try:
+        result = subprocess.run(
+            [AGENT_BROWSER, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        ok = result.returncode == 0
+    except:
+        ok = False
+
+    _AVAIL_CACHE.update(ok=ok, ts=now)
+    return ok
+
 
 class BrowserDiscovery:
     """Discovers earning opportunities via browser automation"""
@@ -22,14 +65,22 @@ class BrowserDiscovery:
 
     def _run(self, args: list) -> str:
         """Run agent-browser command"""
+        session = _SESSION.get()
+        if session:
+            args = ["--session", session] + args
         try:
-            result = subprocess.run(
-                [AGENT_BROWSER] + args,
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-            return result.stdout + result.stderr
+            # Only stdout is used; our pipes are non-inheritable, so there's
+            # nothing for close_fds to clean up in the child
+            with _BROWSER_SEM:
+                result = subprocess.run(
+                    [AGENT_BROWSER] + args,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    timeout=30,
+                    close_fds=False,
+                )
+            return result.stdout
         except Exception as e:
             logger.error(f"Browser error: {e}")
             return ""
@@ -108,8 +159,30 @@ class BrowserDiscovery:
             "details": "Browser automation ready",
         }
 
+    def _in_session(self, name: str, func):
+        """Run a platform check against its own agent-browser session"""
+        token = _SESSION.set(f"maxbitcoins-{name}")
+        try:
+            return func()
+        finally:
+            _SESSION.reset(token)
+
     def discover_all(self) -> dict:
-        """Discover opportunities across all platforms"""
+        """Discover opportunities across all platforms (reused for DISCOVERY_TTL)"""
+        cached = _DISCOVERY_CACHE["result"]
+        if cached and time.monotonic() - _DISCOVERY_CACHE["ts"] < DISCOVERY_TTL:
+            logger.info("Reusing recent browser discovery results")
+            return cached
+
+        if not self.is_available():
+            logger.warning("agent-browser not available - skipping discovery")
+            return {"opportunities": [], "total_found": 0}
+
+        result = self._discover_all()
+        _DISCOVERY_CACHE.update(result=result, ts=time.monotonic())
+        return result
+
+    def _discover_all(self) -> dict:
         results = []
 
         platforms = [
@@ -119,18 +192,27 @@ class BrowserDiscovery:
             ("nostr_dvm", self.check_nostr_dvm),
         ]
 
-        for name, func in platforms:
-            try:
-                result = func()
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error checking {name}: {e}")
-                results.append(
-                    {
-                        "platform": name,
-                        "error": str(e),
-                    }
-                )
+        time.sleep(random.uniform(0, START_JITTER_SECONDS))
+
+        # Each check mostly waits on agent-browser subprocesses - run them together
+        with ThreadPoolExecutor(max_workers=len(platforms)) as pool:
+            futures = {
+                pool.submit(self._in_session, name, func): name
+                for name, func in platforms
+            }
+            # Collect in platform order so the oracle prompt (and its caches)
+            # see the same layout every run
+            for future, name in futures.items():
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error checking {name}: {e}")
+                    results.append(
+                        {
+                            "platform": name,
+                            "error": str(e),
+                        }
+                    )
 
         return {
             "opportunities": results,
@@ -139,13 +221,4 @@ class BrowserDiscovery:
 
     def is_available(self) -> bool:
         """Check if browser is available"""
-        try:
-            result = subprocess.run(
-                [AGENT_BROWSER, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            return result.returncode == 0
-        except:
-            return False
+        return _agent_browser_available()
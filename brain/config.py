@@ -3,12 +3,15 @@ Configuration management - fetches secrets from 1Password
 """
 
 import os
-import subprocess
 from dataclasses import dataclass
+from functools import cache
 
 
+@cache
 def get_op_secret(item: str, field: str) -> str:
     """Fetch secret from 1Password"""
+    import subprocess
+
     try:
         result = subprocess.run(
             ["op", "item", "get", item, "--vault", "Agents", "--format", "json"],
@@ -19,9 +22,9 @@ def get_op_secret(item: str, field: str) -> str:
         if result.returncode != 0:
             return ""
 
-        import json
+        from brain import jsonio
 
-        data = json.loads(result.stdout)
+        data = jsonio.loads(result.stdout)
         for f in data.get("fields", []):
             if f.get("label", "").lower() == field.lower():
                 return f.get("value", "") or ""
@@ -30,7 +33,42 @@ def get_op_secret(item: str, field: str) -> str:
         return ""
 
 
-@dataclass
+def get_op_secrets(refs: list) -> dict:
+    """Fetch several (item, field) secrets with a single `op inject` call.
+
+    Falls back to one `op item get` per secret if the batch call fails.
+    """
+    if not refs:
+        return {}
+
+    import subprocess
+
+    template = "".join(
+        f"{i}={{{{ op://Agents/{item}/{field} }}}}\n"
+        for i, (item, field) in enumerate(refs)
+    )
+    try:
+        result = subprocess.run(
+            ["op", "inject"],
+            input=template,
+            capture_output=True,
+            text=True,
+            timeout=15,
+        )
+        if result.returncode == 0:
+            secrets = {}
+            for line in result.stdout.splitlines():
+                index, _, value = line.partition("=")
+                if index.isdigit() and int(index) < len(refs):
+                    secrets[refs[int(index)]] = value
+            return secrets
+    except Exception:
+        pass
+
+    return {(item, field): get_op_secret(item, field) for item, field in refs}
+
+
+@dataclass(slots=True)
 class Config:
     # LNbits
     lnurl: str
@@ -60,38 +98,54 @@ class Config:
     # Settings
     run_interval_minutes: int
     max_loss_per_day: int
+    action_strategy: str
 
     @classmethod
+    @cache
     def from_env(cls):
-        # Fetch secrets from 1Password
-        minimax_key = os.getenv("MINIMAX_API_KEY") or get_op_secret(
-            "MiniMax", "API Key"
+        """Build the config once per process (call after load_dotenv)"""
+        env = dict(os.environ)
+
+        # Fetch secrets missing from the environment from 1Password in one go
+        op_refs = {
+            "MINIMAX_API_KEY": ("MiniMax", "API Key"),
+            "ZAI_API_KEY": ("Z.ai", "API Key"),
+            "ORACLE_API_KEY": ("Oracle", "API Key"),
+        }
+        op_secrets = get_op_secrets(
+            [ref for var, ref in op_refs.items() if not env.get(var)]
         )
-        zai_key = os.getenv("ZAI_API_KEY") or get_op_secret("Z.ai", "API Key")
-        oracle_key = os.getenv("ORACLE_API_KEY") or get_op_secret("Oracle", "API Key")
+
+        def secret(var: str) -> str:
+            return env.get(var) or op_secrets.get(op_refs[var], "")
+
+        minimax_key = secret("MINIMAX_API_KEY")
+        zai_key = secret("ZAI_API_KEY")
+        oracle_key = secret("ORACLE_API_KEY")
 
         return cls(
             # LNbits
-            lnurl=os.getenv("LNURL", ""),
-            lnbits_url=os.getenv("LNBITS_URL", "https://lnbits.klabo.world"),
-            lnbits_key=os.getenv("LNBITS_KEY", ""),
+            lnurl=env.get("LNURL", ""),
+            lnbits_url=env.get("LNBITS_URL", "https://lnbits.klabo.world"),
+            lnbits_key=env.get("LNBITS_KEY", ""),
             # Nostr
-            nostr_private_key=os.getenv("NOSTR_PRIVATE_KEY", ""),
+            nostr_private_key=env.get("NOSTR_PRIVATE_KEY", ""),
             # Cloudflare
-            cf_api_token=os.getenv("CF_API_TOKEN", ""),
+            cf_api_token=env.get("CF_API_TOKEN", ""),
             # LLM Providers
             minimax_api_key=minimax_key,
-            minimax_model=os.getenv("MINIMAX_MODEL", "MiniMax-M2.5"),
+            minimax_model=env.get("MINIMAX_MODEL", "MiniMax-M2.5"),
             zai_api_key=zai_key,
-            zai_model=os.getenv("ZAI_MODEL", "glm-4-flash"),
-            ollama_host=os.getenv("OLLAMA_HOST", "http://localhost:11434"),
-            ollama_model=os.getenv("OLLAMA_MODEL", "qwen2.5-coder:14b"),
+            zai_model=env.get("ZAI_MODEL", "glm-4-flash"),
+            ollama_host=env.get("OLLAMA_HOST", "http://localhost:11434"),
+            ollama_model=env.get("OLLAMA_MODEL", "qwen2.5-coder:14b"),
             # Oracle
-            use_oracle=os.getenv("USE_ORACLE", "false").lower() == "true",
+            use_oracle=env.get("USE_ORACLE", "false").lower() == "true",
             oracle_api_key=oracle_key,
-            oracle_remote_host=os.getenv("ORACLE_REMOTE_HOST", ""),
-            oracle_remote_token=os.getenv("ORACLE_REMOTE_TOKEN", ""),
+            oracle_remote_host=env.get("ORACLE_REMOTE_HOST", ""),
+            oracle_remote_token=env.get("ORACLE_REMOTE_TOKEN", ""),
             # Settings
-            run_interval_minutes=int(os.getenv("RUN_INTERVAL_MINUTES", "30")),
-            max_loss_per_day=int(os.getenv("MAX_LOSS_PER_DAY", "2000")),
+            run_interval_minutes=int(env.get("RUN_INTERVAL_MINUTES", "30")),
+            max_loss_per_day=int(env.get("MAX_LOSS_PER_DAY", "2000")),
+            action_strategy=env.get("ACTION_STRATEGY", "strategic").lower(),
         )
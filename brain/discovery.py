@@ -2,11 +2,13 @@
 External opportunity discovery
 """
 import logging
-import requests
 from brain.config import Config
+from brain.http_client import new_session
 
 logger = logging.getLogger(__name__)
 
+_SESSION = new_session()
+
 
 class Discovery:
     def __init__(self, config: Config):
@@ -16,7 +18,7 @@ class Discovery:
         """Check Stacker News for bounties"""
         # Simplified - check for recent bounty posts
         try:
-            resp = requests.get(
+            resp = _SESSION.get(
                 "https://stackernews.it/api/items?limit=20",
                 timeout=15
             )
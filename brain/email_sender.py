@@ -3,9 +3,9 @@ Email sending for MaxBitcoins outreach
 """
 
 import logging
-from datetime import datetime
+import time
 from pathlib import Path
-import json
+from brain import jsonio
 from brain.config import Config
 
 logger = logging.getLogger(__name__)
@@ -45,33 +45,41 @@ class EmailSender:
         """Load email state"""
         if self.state_file.exists():
             try:
-                self.state = json.loads(self.state_file.read_text())
+                self.state = jsonio.loads(self.state_file.read_bytes())
             except:
                 self.state = {
                     "emails_today": 0,
-                    "last_email_date": "",
+                    "last_email_date": 0,
                     "failed_count": 0,
                     "leads_contacted": [],
                 }
         else:
             self.state = {
                 "emails_today": 0,
-                "last_email_date": "",
+                "last_email_date": 0,
                 "failed_count": 0,
                 "leads_contacted": [],
             }
 
+        self._contacted = set(self.state.setdefault("leads_contacted", []))
+        self._dirty = False
+
     def _save_state(self):
-        """Save email state"""
-        self.state_file.write_text(json.dumps(self.state, indent=2))
+        """Save email state (only if something changed)"""
+        if not self._dirty:
+            return
+        tmp = self.state_file.with_suffix(".tmp")
+        tmp.write_bytes(jsonio.encode(self.state))
+        tmp.replace(self.state_file)
+        self._dirty = False
 
     def _reset_daily(self):
         """Reset daily counter"""
-        today = datetime.now().date().isoformat()
+        today = int(time.time()) // 86400  # UTC day index
         if self.state.get("last_email_date") != today:
             self.state["emails_today"] = 0
             self.state["last_email_date"] = today
-            self._save_state()
+            self._dirty = True
 
     def can_send(self) -> bool:
         """Check if we can send email today"""
@@ -88,19 +96,18 @@ class EmailSender:
         if success:
             self.state["emails_today"] = self.state.get("emails_today", 0) + 1
             self.state["failed_count"] = 0
-            contacted = self.state.get("leads_contacted", [])
-            if lead_name not in contacted:
-                contacted.append(lead_name)
-            self.state["leads_contacted"] = contacted
+            if lead_name not in self._contacted:
+                self._contacted.add(lead_name)
+                self.state["leads_contacted"].append(lead_name)
         else:
             self.state["failed_count"] = self.state.get("failed_count", 0) + 1
+        self._dirty = True
         self._save_state()
 
     def get_next_lead(self) -> dict:
         """Get next warm lead to contact"""
-        contacted = self.state.get("leads_contacted", [])
         for lead in self.warm_leads:
-            if lead["name"] not in contacted:
+            if lead["name"] not in self._contacted:
                 return lead
         return None
 
@@ -122,7 +129,7 @@ Keep email:
 - Clear call to action
 - Subject line included"""
 
-        email_text = llm.generate(prompt, max_tokens=500)
+        email_text = llm.cached_generate(prompt, intent="email")
 
         # Split into subject and body
         lines = email_text.split("\n", 1)
@@ -0,0 +1,46 @@
+"""
+Shared HTTP session setup for MaxBitcoins
+Pooled keep-alive connections so repeat calls skip the TCP/TLS handshake
+"""
+
+import atexit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "maxbitcoins/1.0"
+RETRY_STATUSES = (502, 503, 504)
+
+
+def new_session(
+    pool_connections: int = 4,
+    pool_maxsize: int = 8,
+    retries: int = 2,
+    connect_retries: int = None,
+):
+    """requests.Session with connection pooling and retry on transient errors.
+
+    connect_retries caps retries of failed connects separately - urllib3 retries
+    those for every method, POST included, each one costing a full connect timeout.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            connect=connect_retries,
+            backoff_factor=0.3,
+            # Gateway errors from a proxy in front of the API are worth one more try.
+            # Only idempotent methods are retried after a request was sent, so LLM
+            # POSTs are never sent twice
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
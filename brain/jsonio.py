@@ -0,0 +1,32 @@
+"""
+JSON helpers for state files
+Uses orjson when it's installed, stdlib json otherwise
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (request bodies and state files)"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compact(obj) -> str:
+    """Serialize prompt payloads without indentation - the LLM doesn't need it"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"))
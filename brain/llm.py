@@ -3,163 +3,359 @@ LLM provider with automatic fallback chain
 Priority: MiniMax -> Z.ai -> Ollama
 """
 
-import json
 import logging
 import os
-import requests
+import random
+import re
+import shutil
 import subprocess
 import time
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import closing
+from functools import wraps
+from pathlib import Path
+from string import Template
+from typing import Callable, Iterator, Optional
+from requests.exceptions import RequestException
 from brain.config import Config
+from brain.http_client import new_session
+from brain import jsonio
+from brain.llm_cache import LLMCache, cache_key
 
 logger = logging.getLogger(__name__)
 
+# One pooled session for every provider - keeps connections to each API warm.
+# No connect retries: an unreachable provider should fall back after one
+# CONNECT_TIMEOUT, and _call_provider already decides what is worth retrying
+_SESSION = new_session(pool_connections=4, pool_maxsize=16, connect_retries=0)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Output token caps by what the answer is for - generation time grows with output length
+TOKEN_BUDGETS = {
+    "execution_report": 2000,
+    "article": 1600,
+    "email": 500,
+    "oracle_fallback": 500,
+    "generic": 1024,
+}
+
+CONTENT_CACHE_TTL = 7 * 24 * 3600  # generated emails stay reusable for a week
+CONNECT_TIMEOUT = 5  # seconds to reach a provider before falling back
+DETECT_TIMEOUT = 6  # seconds to wait for provider availability probes
+CACHE_TEMPERATURE = 0.0  # cached responses are generated deterministically
+RETRY_BACKOFF = 2  # seconds before retrying a rate-limited/5xx provider (jittered)
+BREAKER_THRESHOLD = 2  # consecutive failures before a provider is paused
+BREAKER_COOLDOWNS = (60, 120, 300)  # seconds, escalating each time it trips again
+BREAKER_LATENCY_WINDOW = 10  # recent successful calls averaged for slowness
+BREAKER_SLOW_SECONDS = 60  # average latency that pauses a provider like a failure
+CHROME_STARTUP_SECONDS = 3  # time Oracle's Chrome needs before it accepts connections
+
+
+def ttl_cache(seconds: float, jitter: float = 0.0):
+    """Cache a method's result on the instance for `seconds` (per argument tuple).
+
+    jitter spreads expiries by +/- that many seconds so instances don't re-probe in step.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args):
+            cache = self.__dict__.setdefault("_ttl_cache", {})
+            key = (func.__name__, args)
+            hit = cache.get(key)
+            now = time.monotonic()
+            if hit and hit[1] > now:
+                return hit[0]
+            value = func(self, *args)
+            cache[key] = (value, now + seconds + random.uniform(-jitter, jitter))
+            return value
+
+        def forget(self, *args):
+            """Drop the cached result so the next call runs for real"""
+            self.__dict__.get("_ttl_cache", {}).pop((func.__name__, args), None)
+
+        wrapper.forget = forget
+        return wrapper
+
+    return decorator
+
+
+def cacheable_system(system: str) -> list:
+    """Anthropic-style system block marked for prompt prefix caching.
+
+    The provider only reuses the cached prefix when the system text is
+    byte-identical between calls, so callers should pass module constants.
+    """
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+class ProviderError(Exception):
+    """A provider request failed"""
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
 
-class LLMProvider:
-    """Base class for LLM providers"""
 
-    def generate(self, prompt: str, system: str = None, max_tokens: int = 2048) -> str:
+class RetryableError(ProviderError):
+    """Rate limit, server error or network failure - may succeed if tried again"""
+
+
+class TerminalError(ProviderError):
+    """The provider rejected the request (4xx) - retrying it won't help"""
+
+
+def _raise_for_status(name: str, resp):
+    """Turn a non-200 provider response into a typed error"""
+    if resp.status_code == 200:
+        return
+    message = f"{name} request failed: {resp.status_code} - {resp.text[:200]}"
+    if resp.status_code in (408, 429) or resp.status_code >= 500:
+        raise RetryableError(message, resp.status_code)
+    raise TerminalError(message, resp.status_code)
+
+
+class LLMProvider:
+    """Base class for LLM providers.
+
+    generate and generate_stream raise RetryableError/TerminalError on failed
+    requests; generate returns "" when the request succeeded but produced no text.
+    """
+
+    def generate(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+    ) -> str:
         raise NotImplementedError
 
     def is_available(self) -> bool:
         raise NotImplementedError
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        stop: list = None,
+        temperature: float = 0.7,
+    ) -> Iterator[str]:
+        """Yield the completion in chunks. Providers without streaming yield it whole."""
+        result = self.generate(prompt, system, max_tokens, temperature)
+        if result:
+            yield result
+
+
+def iter_sse_data(resp) -> Iterator[dict]:
+    """Decode the JSON payloads of a server-sent-events response"""
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            yield jsonio.loads(data)
+        except ValueError:
+            continue
 
-class MiniMaxProvider(LLMProvider):
-    """MiniMax API provider - uses anthropic-compatible endpoint"""
 
-    def __init__(self, config: Config):
-        self.api_key = config.minimax_api_key
-        self.model = config.minimax_model
-        self.base_url = (
-            "https://api.minimax.io/anthropic"  # Anthropic-compatible endpoint
+class HostedProvider(LLMProvider):
+    """Shared request path for the API-key providers: one pooled POST, typed errors.
+
+    Subclasses supply the wire format via _payload, _parse and _stream_text.
+    """
+
+    label = "LLM"
+    timeout = (CONNECT_TIMEOUT, 120)  # (connect, read)
+    url = ""
+
+    def _set_api_key(self, api_key: str):
+        self.api_key = api_key
+        self._headers = {"Authorization": f"Bearer {api_key}", **JSON_HEADERS}
+
+    def _payload(
+        self, prompt: str, system: str, max_tokens: int, temperature: float, stop: list
+    ) -> dict:
+        raise NotImplementedError
+
+    def _parse(self, data: dict) -> str:
+        raise NotImplementedError
+
+    def _stream_text(self, events: Iterator[dict]) -> Iterator[str]:
+        raise NotImplementedError
+
+    def _post(self, payload: dict, stream: bool = False):
+        return _SESSION.post(
+            self.url,
+            headers=self._headers,
+            data=jsonio.encode(payload),
+            timeout=self.timeout,
+            stream=stream,
         )
 
-    def generate(self, prompt: str, system: str = None, max_tokens: int = 2048) -> str:
+    def generate(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+    ) -> str:
         if not self.api_key:
             return ""
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            # Anthropic-compatible format
-            messages = []
-            if system:
-                messages.append(
-                    {"role": "user", "content": f"System: {system}\n\n{prompt}"}
-                )
-            else:
-                messages.append({"role": "user", "content": prompt})
-
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": 0.7,
-            }
-
-            resp = requests.post(
-                f"{self.base_url}/v1/messages",
-                headers=headers,
-                json=payload,
-                timeout=120,
-            )
-
-            logger.warning(
-                f"MiniMax request response: {resp.status_code} - {resp.text[:200]}"
-            )
+            payload = self._payload(prompt, system, max_tokens, temperature, None)
+            resp = self._post(payload)
+            logger.debug(f"{self.label} response: {resp.status_code} {resp.text[:200]}")
 
             if resp.status_code == 200:
-                data = resp.json()
-                # Anthropic format: content is an array with different types (text, thinking)
-                content = data.get("content", [])
-                logger.info(
-                    f"MiniMax content items: {len(content)} - types: {[c.get('type') for c in content]}"
-                )
-                for item in content:
-                    if item.get("type") == "text":
-                        return item.get("text", "").strip()
-                # If no text found, extract from thinking (MiniMax sometimes only returns thinking)
-                for item in content:
-                    if item.get("type") == "thinking":
-                        thinking = item.get("thinking", "")
-                        # Extract the actual response from thinking
-                        if thinking:
-                            return thinking.strip()
-                logger.warning(
-                    f"No text or thinking found in MiniMax response: {content}"
-                )
-                return ""
+                return self._parse(jsonio.loads(resp.content))
 
-            logger.warning(f"MiniMax request failed: {resp.status_code} - {resp.text}")
-            return ""
+            _raise_for_status(self.label, resp)
 
+        except ProviderError:
+            raise
+        except RequestException as e:
+            raise RetryableError(f"Error calling {self.label}: {e}") from e
         except Exception as e:
-            logger.error(f"Error calling MiniMax: {e}")
+            logger.error(f"Error calling {self.label}: {e}")
             return ""
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        stop: list = None,
+        temperature: float = 0.7,
+    ) -> Iterator[str]:
+        if not self.api_key:
+            return
+
+        payload = self._payload(prompt, system, max_tokens, temperature, stop)
+        payload["stream"] = True
+
+        try:
+            with self._post(payload, stream=True) as resp:
+                _raise_for_status(self.label, resp)
+                yield from self._stream_text(iter_sse_data(resp))
+        except ProviderError:
+            raise
+        except RequestException as e:
+            raise RetryableError(f"Error streaming from {self.label}: {e}") from e
+        except Exception as e:
+            logger.error(f"Error streaming from {self.label}: {e}")
+
     def is_available(self) -> bool:
         return bool(self.api_key)
 
 
-class ZAIGLMProvider(LLMProvider):
-    """Z.ai GLM provider (compatible with OpenAI API)"""
+class MiniMaxProvider(HostedProvider):
+    """MiniMax API provider - uses anthropic-compatible endpoint"""
+
+    label = "MiniMax"
+    url = "https://api.minimax.io/anthropic/v1/messages"  # Anthropic-compatible
 
     def __init__(self, config: Config):
-        self.api_key = config.zai_api_key
-        self.model = config.zai_model
-        self.base_url = "https://open.bigmodel.cn/api/paas/v4"
+        self._set_api_key(config.minimax_api_key)
+        self.model = config.minimax_model
 
-    def generate(self, prompt: str, system: str = None, max_tokens: int = 2048) -> str:
-        if not self.api_key:
-            return ""
+    def _payload(self, prompt, system, max_tokens, temperature, stop) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "user", "content": [{"type": "text", "text": prompt}]}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if system:
+            payload["system"] = cacheable_system(system)
+        if stop:
+            payload["stop_sequences"] = stop
+        return payload
+
+    def _parse(self, data: dict) -> str:
+        # Anthropic format: content is an array with different types (text, thinking)
+        content = data.get("content", [])
+        logger.info(
+            f"{self.label} content items: {len(content)} - types: {[c.get('type') for c in content]}"
+        )
+        for item in content:
+            if item.get("type") == "text":
+                return item.get("text", "").strip()
+        # If no text found, extract from thinking (MiniMax sometimes only returns thinking)
+        for item in content:
+            if item.get("type") == "thinking":
+                thinking = item.get("thinking", "")
+                # Extract the actual response from thinking
+                if thinking:
+                    return thinking.strip()
+        logger.warning(f"No text or thinking found in {self.label} response: {content}")
+        return ""
 
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            messages = []
-            if system:
-                messages.append({"role": "system", "content": system})
-            messages.append({"role": "user", "content": prompt})
-
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": 0.7,
-            }
-
-            resp = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=120,
-            )
+    def _stream_text(self, events: Iterator[dict]) -> Iterator[str]:
+        # As in _parse, fall back to the thinking when no text block arrives
+        thinking = []
+        produced = False
+        for event in events:
+            if event.get("type") == "content_block_delta":
+                delta = event.get("delta", {})
+                if delta.get("type") == "thinking_delta":
+                    thinking.append(delta.get("thinking", ""))
+                elif delta.get("text"):
+                    produced = True
+                    yield delta["text"]
+            elif event.get("type") == "message_stop":
+                break
+        if not produced and thinking:
+            yield "".join(thinking).strip()
+
+
+class ZAIGLMProvider(HostedProvider):
+    """Z.ai GLM provider (compatible with OpenAI API)"""
 
-            if resp.status_code == 200:
-                data = resp.json()
-                return (
-                    data.get("choices", [{}])[0]
-                    .get("message", {})
-                    .get("content", "")
-                    .strip()
-                )
+    label = "Z.ai"
+    url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
 
-            logger.warning(f"Z.ai request failed: {resp.status_code} - {resp.text}")
-            return ""
+    def __init__(self, config: Config):
+        self._set_api_key(config.zai_api_key)
+        self.model = config.zai_model
 
-        except Exception as e:
-            logger.error(f"Error calling Z.ai: {e}")
+    def _payload(self, prompt, system, max_tokens, temperature, stop) -> dict:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if stop:
+            payload["stop"] = stop
+        return payload
+
+    def _parse(self, data: dict) -> str:
+        try:
+            return data["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError, AttributeError):
             return ""
 
-    def is_available(self) -> bool:
-        return bool(self.api_key)
+    def _stream_text(self, events: Iterator[dict]) -> Iterator[str]:
+        for event in events:
+            for choice in event.get("choices", []):
+                text = choice.get("delta", {}).get("content")
+                if text:
+                    yield text
 
 
 class OllamaProvider(LLMProvider):
@@ -169,42 +365,102 @@ class OllamaProvider(LLMProvider):
         self.host = config.ollama_host
         self.model = config.ollama_model
 
-    def generate(self, prompt: str, system: str = None, max_tokens: int = 2048) -> str:
+    def generate(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+    ) -> str:
+        # Stream even for a full answer so Ollama starts sending tokens right away
+        # and the connection is released as soon as it reports done
+        payload = self._payload(prompt, system, max_tokens, None, temperature)
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": 0.7,
-                },
-            }
-            if system:
-                payload["system"] = system
-
-            resp = requests.post(f"{self.host}/api/generate", json=payload, timeout=120)
-            if resp.status_code == 200:
-                data = resp.json()
-                return data.get("response", "").strip()
-            logger.warning(f"Ollama request failed: {resp.status_code}")
-            return ""
+            return "".join(self._stream(payload)).strip()
+        except ProviderError:
+            raise
+        except RequestException as e:
+            OllamaProvider.is_available.forget(self)  # re-probe before trusting it again
+            raise RetryableError(f"Error calling Ollama: {e}") from e
         except Exception as e:
             logger.error(f"Error calling Ollama: {e}")
             return ""
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        stop: list = None,
+        temperature: float = 0.7,
+    ) -> Iterator[str]:
+        payload = self._payload(prompt, system, max_tokens, stop, temperature)
+        try:
+            yield from self._stream(payload)
+        except ProviderError:
+            raise
+        except RequestException as e:
+            OllamaProvider.is_available.forget(self)
+            raise RetryableError(f"Error streaming from Ollama: {e}") from e
+        except Exception as e:
+            logger.error(f"Error streaming from Ollama: {e}")
+
+    def _payload(
+        self,
+        prompt: str,
+        system: str,
+        max_tokens: int,
+        stop: list,
+        temperature: float,
+    ) -> dict:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+            },
+        }
+        if system:
+            payload["system"] = system
+        if stop:
+            payload["options"]["stop"] = stop
+        return payload
+
+    def _stream(self, payload: dict) -> Iterator[str]:
+        """POST /api/generate and yield the NDJSON response chunks until done"""
+        with _SESSION.post(
+            f"{self.host}/api/generate",
+            headers=JSON_HEADERS,
+            data=jsonio.encode(payload),
+            timeout=(CONNECT_TIMEOUT, 120),
+            stream=True,
+        ) as resp:
+            _raise_for_status("Ollama", resp)
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = jsonio.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    return
+
+    @ttl_cache(60, jitter=2)
     def is_available(self) -> bool:
         try:
-            resp = requests.get(f"{self.host}/api/tags", timeout=5)
+            resp = _SESSION.get(f"{self.host}/api/tags", timeout=5)
             return resp.status_code == 200
         except:
             return False
 
+    @ttl_cache(60)
     def list_models(self) -> list:
         try:
-            resp = requests.get(f"{self.host}/api/tags", timeout=10)
+            resp = _SESSION.get(f"{self.host}/api/tags", timeout=10)
             if resp.status_code == 200:
-                data = resp.json()
+                data = jsonio.loads(resp.content)
                 return [m["name"] for m in data.get("models", [])]
             return []
         except Exception as e:
@@ -212,78 +468,115 @@ class OllamaProvider(LLMProvider):
             return []
 
 
-class OracleProvider(LLMProvider):
+class OracleProvider(MiniMaxProvider):
     """Oracle API provider - asks what to do to make money (uses MiniMax)"""
 
-    def __init__(self, config: Config):
-        self.api_key = config.oracle_api_key or config.minimax_api_key
-        self.model = config.minimax_model
-        self.base_url = "https://api.minimax.io/anthropic"
-
-    def generate(self, prompt: str, system: str = None, max_tokens: int = 2048) -> str:
-        if not self.api_key:
-            return ""
-
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            # Anthropic-compatible format
-            messages = []
-            if system:
-                messages.append(
-                    {"role": "user", "content": f"System: {system}\n\n{prompt}"}
-                )
-            else:
-                messages.append({"role": "user", "content": prompt})
-
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": 0.9,  # Higher temp for creative suggestions
-            }
-
-            resp = requests.post(
-                f"{self.base_url}/v1/messages",
-                headers=headers,
-                json=payload,
-                timeout=60,
-            )
+    label = "Oracle"
+    timeout = (CONNECT_TIMEOUT, 60)
 
-            logger.warning(
-                f"Oracle API response: {resp.status_code} - {resp.text[:200]}"
-            )
-
-            if resp.status_code == 200:
-                data = resp.json()
-                content = data.get("content", [])
-                for item in content:
-                    if item.get("type") == "text":
-                        return item.get("text", "").strip()
-                # Fallback to thinking if no text
-                for item in content:
-                    if item.get("type") == "thinking":
-                        return item.get("thinking", "").strip()
-                return ""
-
-            logger.warning(f"Oracle request failed: {resp.status_code}")
-            return ""
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self._set_api_key(config.oracle_api_key or config.minimax_api_key)
+
+    def generate(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.9,  # Higher temp for creative suggestions
+    ) -> str:
+        return super().generate(prompt, system, max_tokens, temperature)
+
+
+def _provider_generate(
+    provider: LLMProvider,
+    prompt: str,
+    system: str,
+    max_tokens: int,
+    temperature: float = None,
+) -> str:
+    """Call provider.generate, keeping the provider's own default temperature unless overridden"""
+    if temperature is None:
+        return provider.generate(prompt, system, max_tokens)
+    return provider.generate(prompt, system, max_tokens, temperature)
+
+
+def _provider_stream(
+    provider: LLMProvider,
+    prompt: str,
+    system: str,
+    max_tokens: int,
+    stop: list = None,
+    temperature: float = None,
+) -> Iterator[str]:
+    """Call provider.generate_stream, with the same temperature default rule as above"""
+    if temperature is None:
+        return provider.generate_stream(prompt, system, max_tokens, stop)
+    return provider.generate_stream(prompt, system, max_tokens, stop, temperature)
+
+
+def token_budget(intent: str, max_tokens: int = None) -> int:
+    """Output token cap for a kind of request, unless the caller gave one explicitly"""
+    if max_tokens:
+        return max_tokens
+    return TOKEN_BUDGETS.get(intent, TOKEN_BUDGETS["generic"])
+
+
+class CircuitBreaker:
+    """Stops calling a provider after repeated failures, with escalating cooldowns.
+
+    After a cooldown the provider is half-open: one more failure re-opens it
+    straight away, a success closes it again.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldowns=BREAKER_COOLDOWNS):
+        self.threshold = threshold
+        self.cooldowns = cooldowns
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.latencies = deque(maxlen=BREAKER_LATENCY_WINDOW)
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def success(self, seconds: float = None) -> bool:
+        """Count a success; returns True if sustained slowness opened the breaker"""
+        self.failures = 0
+        if seconds is not None:
+            self.latencies.append(seconds)
+            if (
+                len(self.latencies) == self.latencies.maxlen
+                and sum(self.latencies) / len(self.latencies) > BREAKER_SLOW_SECONDS
+            ):
+                self.latencies.clear()
+                return self._open()
+        self.trips = 0
+        return False
+
+    def failure(self) -> bool:
+        """Count a failure; returns True if this one opened the breaker"""
+        self.failures += 1
+        if self.failures < (1 if self.trips else self.threshold):
+            return False
+        return self._open()
 
-        except Exception as e:
-            logger.error(f"Error calling Oracle: {e}")
-            return ""
+    def _open(self) -> bool:
+        cooldown = self.cooldowns[min(self.trips, len(self.cooldowns) - 1)]
+        self.open_until = time.monotonic() + cooldown
+        self.trips += 1
+        self.failures = 0
+        return True
 
-    def is_available(self) -> bool:
-        return bool(self.api_key)
+    def disable(self):
+        """Open for good - e.g. the provider rejected our credentials"""
+        self.open_until = float("inf")
 
 
 class LLM:
     """LLM with automatic provider fallback"""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, skip_if: Callable[[str], bool] = None):
         self.config = config
 
         # Initialize providers in priority order
@@ -293,40 +586,179 @@ class LLM:
             ("ollama", OllamaProvider(config)),
         ]
 
+        self.content_cache = LLMCache(ttl=CONTENT_CACHE_TTL)
+
+        # Providers that keep failing are skipped for a while; skip_if(name) lets
+        # callers switch one off entirely (e.g. when its quota is used up)
+        self._breakers = {name: CircuitBreaker() for name, _ in self.providers}
+        self._browser_oracle = None
+        self.skip_if = skip_if
+
         # Find first available provider
         self.current_provider = None
         self.current_name = None
         self._detect_provider()
 
     def _detect_provider(self):
-        """Detect first available provider"""
+        """Detect first available provider (probes run in parallel)"""
+        pool = ThreadPoolExecutor(max_workers=len(self.providers))
+        probes = {
+            name: pool.submit(provider.is_available)
+            for name, provider in self.providers
+        }
+        try:
+            # Settle as soon as the most preferred live provider is known rather
+            # than waiting for every probe (a slow fallback would hold us up)
+            for _ in as_completed(probes.values(), timeout=DETECT_TIMEOUT):
+                if self._pick_provider(probes, settled_only=True):
+                    break
+            else:
+                self._pick_provider(probes)
+        except FuturesTimeout:
+            self._pick_provider(probes)
+        pool.shutdown(wait=False)  # don't block on a probe that's still hanging
+
+        if not self.current_provider:
+            logger.warning("No LLM provider available!")
+
+    def _pick_provider(self, probes: dict, settled_only: bool = False) -> bool:
+        """Select the first provider whose probe passed, in priority order.
+
+        With settled_only, give up at the first probe still running, since a
+        preferred provider may yet come back available.
+        """
         for name, provider in self.providers:
-            if provider.is_available():
+            probe = probes[name]
+            if not probe.done():
+                if settled_only:
+                    return False
+                continue
+            if not probe.exception() and probe.result():
                 self.current_provider = provider
                 self.current_name = name
                 logger.info(f"Using LLM provider: {name}")
-                return
-
-        logger.warning("No LLM provider available!")
+                return True
+        return False
+
+    def generate(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = None,
+        temperature: float = None,
+        cacheable: bool = False,
+        intent: str = "generic",
+    ) -> str:
+        """Generate text with automatic fallback.
 
-    def generate(self, prompt: str, system: str = None, max_tokens: int = 2048) -> str:
-        """Generate text with automatic fallback"""
+        max_tokens defaults to the TOKEN_BUDGETS entry for intent.
+        cacheable=True answers repeats of the same request from the response
+        cache (see cached_generate).
+        """
+        max_tokens = token_budget(intent, max_tokens)
+        if cacheable:
+            return self.cached_generate(prompt, system, max_tokens)
 
         # Try current provider first
-        if self.current_provider:
-            result = self.current_provider.generate(prompt, system, max_tokens)
+        if self.current_provider and not self._skip(self.current_name):
+            result = self._call_provider(
+                self.current_name,
+                self.current_provider,
+                prompt,
+                system,
+                max_tokens,
+                temperature,
+            )
             if result:
                 return result
 
             # Current failed, try to find another provider
             logger.warning(f"Provider {self.current_name} failed, trying fallback...")
 
-        # Try all providers as fallback
+        return self._generate_fallback(prompt, system, max_tokens, temperature)
+
+    def cached_generate(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = None,
+        intent: str = "generic",
+    ) -> str:
+        """generate() memoized on disk by prompt hash - for prompts drawn from a fixed set.
+
+        Runs at temperature 0 so a cached answer is the one the model would give anyway.
+        """
+        max_tokens = token_budget(intent, max_tokens)
+        cached = self.content_cache.get(self._content_key(prompt, system, max_tokens))
+        if cached:
+            return cached
+
+        result = self.generate(prompt, system, max_tokens, CACHE_TEMPERATURE)
+        if result:
+            # Keyed on whichever provider answered, in case the call fell back
+            key = self._content_key(prompt, system, max_tokens)
+            self.content_cache.set(key, result)
+        return result
+
+    def _content_key(self, prompt: str, system: str, max_tokens: int) -> str:
+        return cache_key(
+            provider=self.provider_name(),
+            model=getattr(self.current_provider, "model", None),
+            system=system,
+            prompt=prompt,
+            max_tokens=max_tokens,
+        )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system: str = None,
+        max_tokens: int = None,
+        stop: list = None,
+        intent: str = "generic",
+        temperature: float = None,
+    ) -> Iterator[str]:
+        """Stream from the current provider; fall back to a full generate if it yields nothing.
+
+        Close the iterator (or let it go out of scope) to abandon the request early.
+        Raises ProviderError if the stream breaks after part of the answer was yielded.
+        """
+        max_tokens = token_budget(intent, max_tokens)
+        if self.current_provider and not self._skip(self.current_name):
+            produced = False
+            stream = self._stream_provider(
+                self.current_name,
+                self.current_provider,
+                prompt,
+                system,
+                max_tokens,
+                stop,
+                temperature,
+            )
+            with closing(stream):
+                for chunk in stream:
+                    produced = True
+                    yield chunk
+            if produced:
+                return
+
+            logger.warning(f"Provider {self.current_name} failed, trying fallback...")
+
+        result = self._generate_fallback(prompt, system, max_tokens, temperature)
+        if result:
+            yield result
+
+    def _generate_fallback(
+        self, prompt: str, system: str, max_tokens: int, temperature: float = None
+    ) -> str:
+        """Try every provider other than the current one"""
         for name, provider in self.providers:
-            if provider == self.current_provider:
+            if provider == self.current_provider or self._skip(name):
                 continue
             if provider.is_available():
-                result = provider.generate(prompt, system, max_tokens)
+                result = self._call_provider(
+                    name, provider, prompt, system, max_tokens, temperature
+                )
                 if result:
                     self.current_provider = provider
                     self.current_name = name
@@ -336,6 +768,100 @@ class LLM:
         logger.error("All LLM providers failed")
         return ""
 
+    def _call_provider(
+        self,
+        name: str,
+        provider: LLMProvider,
+        prompt: str,
+        system: str,
+        max_tokens: int,
+        temperature: float = None,
+    ) -> str:
+        """One provider attempt: retry rate limits/server errors once, never retry rejections"""
+        for attempt in range(2):
+            started = time.perf_counter()
+            try:
+                result = _provider_generate(
+                    provider, prompt, system, max_tokens, temperature
+                )
+                self._record_success(name, time.perf_counter() - started)
+                return result
+            except TerminalError as e:
+                self._record_failure(name, e)
+                return ""
+            except RetryableError as e:
+                if self._record_failure(name, e):
+                    return ""
+                # Network errors already spent their timeout - move on to the next provider
+                if e.status is None or attempt:
+                    return ""
+                time.sleep(RETRY_BACKOFF * random.uniform(0.5, 1.5))
+        return ""
+
+    def _stream_provider(
+        self,
+        name: str,
+        provider: LLMProvider,
+        prompt: str,
+        system: str,
+        max_tokens: int,
+        stop: list = None,
+        temperature: float = None,
+    ) -> Iterator[str]:
+        """One streaming attempt, counted against the breaker like _call_provider.
+
+        Not retried - a stream can fail after part of the answer was handed out.
+        A failure before the first chunk just ends the stream (the caller falls
+        back); one after it is re-raised so a fragment isn't taken as complete.
+        """
+        started = time.perf_counter()
+        produced = False
+        stream = _provider_stream(
+            provider, prompt, system, max_tokens, stop, temperature
+        )
+        try:
+            with closing(stream):
+                for chunk in stream:
+                    produced = True
+                    yield chunk
+        except ProviderError as e:
+            self._record_failure(name, e)
+            if produced:
+                raise
+        except GeneratorExit:
+            # Abandoned early by the caller - the provider answered, but the
+            # elapsed time says nothing about how long a full answer takes
+            self._record_success(name)
+            raise
+        else:
+            self._record_success(name, time.perf_counter() - started)
+
+    def _record_success(self, name: str, seconds: float = None):
+        if self._breakers[name].success(seconds):
+            logger.warning(f"Pausing LLM provider {name}: responses too slow")
+
+    def _record_failure(self, name: str, error: ProviderError) -> bool:
+        """Count a failed attempt; returns True if the provider is now paused"""
+        breaker = self._breakers[name]
+        if isinstance(error, TerminalError):
+            logger.error(str(error))
+            if error.status in (401, 403):
+                logger.error(f"Disabling LLM provider {name} for this run")
+                breaker.disable()
+                return True
+        else:
+            logger.warning(str(error))
+        if breaker.failure():
+            logger.warning(f"Pausing LLM provider {name} after repeated failures")
+            return True
+        return False
+
+    def _skip(self, name: str) -> bool:
+        """Whether to leave this provider out of the current call"""
+        if self._breakers[name].is_open():
+            return True
+        return bool(self.skip_if and self.skip_if(name))
+
     def is_available(self) -> bool:
         """Check if any provider is available"""
         return self.current_provider is not None
@@ -351,8 +877,10 @@ class LLM:
         if not self.config.use_oracle:
             return ""
 
-        # Try browser-based oracle first
-        browser_oracle = BrowserOracle(self.config, self)
+        # Try browser-based oracle first (built once, then reused across asks)
+        if self._browser_oracle is None:
+            self._browser_oracle = BrowserOracle(self.config, self)
+        browser_oracle = self._browser_oracle
 
         if browser_oracle.is_available():
             logger.info("Using Browser Oracle for strategic advice...")
@@ -364,9 +892,108 @@ class LLM:
         return ""
 
 
+def _trim(value, max_items: int = 20, max_str: int = 200):
+    """Bound a JSON-able value for a prompt: cap list lengths and long strings"""
+    if isinstance(value, str):
+        return value if len(value) <= max_str else value[:max_str] + "..."
+    if isinstance(value, dict):
+        return {k: _trim(v, max_items, max_str) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_trim(v, max_items, max_str) for v in value[:max_items]]
+    return value
+
+
+def _opportunity_score(entry) -> float:
+    if not isinstance(entry, dict):
+        return 0
+    return entry.get("score", entry.get("opportunities_found", 0)) or 0
+
+
+def _trim_opportunities(opportunities: dict, k: int = 20, max_str: int = 200) -> dict:
+    """Keep the k most promising discovery results, with long values cut short"""
+    found = opportunities.get("opportunities")
+    if isinstance(found, list):
+        ranked = sorted(found, key=_opportunity_score, reverse=True)[:k]
+        opportunities = {**opportunities, "opportunities": ranked}
+    return _trim(opportunities, k, max_str)
+
+
+# The oracle CLI runs from the deployed checkout and may take up to an hour
+ORACLE_HOME = Path("/home/klabo/maxbitcoins")
+ORACLE_CLI_KWARGS = dict(capture_output=True, text=True, timeout=3600, cwd=ORACLE_HOME)
+
+# Prompt sent to Oracle (GPT-5.2 Pro via the oracle CLI) with the codebase attached
+ORACLE_PROMPT = Template(
+    """Current state of the MaxBitcoins autonomous agent:
+- Balance: $balance sats
+- Today's revenue: $daily_revenue sats
+- Last action: $last_action
+
+History (last 10 runs):
+$history
+
+Opportunities found:
+$opportunities
+
+You have access to the full codebase (brain/, data/, main.py, Dockerfile, etc.) attached as files.
+
+Write a detailed strategic analysis (2-3 paragraphs) covering:
+1. Current situation analysis (balance, trends, patterns from history)
+2. What opportunities exist right now in the Lightning/Bitcoin ecosystem
+3. ROI analysis for each potential action
+4. Specific recommendations for how this agent can earn more Bitcoin
+5. Any new strategies, code changes, or ideas that haven't been tried
+
+Then end with your final recommendation. This can be:
+- A specific action (e.g., "post to Nostr about X topic", "apply for Y bounty")
+- A code change to make to the tool itself
+- A new strategy to experiment with
+- Or "monitor" if there's nothing good to do right now
+
+IMPORTANT: Be creative and think long-term. Write as much detail as possible - this will be saved and learned from."""
+)
+
+# Prompt for the regular LLM when Oracle isn't reachable
+FALLBACK_PROMPT = Template(
+    """You are MaxBitcoins Strategic Advisor. You have DISCOVERED real-time opportunities via browser:
+
+## Current State
+- Balance: $balance sats
+- Today's revenue: $daily_revenue sats
+
+## Recent History
+$history
+
+## Discovered Opportunities
+$opportunities
+
+## Your Task
+Analyze the discovered opportunities and recommend ONE action that has the highest potential for earning Bitcoin right now.
+
+Your recommendation can be:
+- A specific action (e.g., "post to Nostr about X topic", "apply for Y bounty")
+- A code change to make to the tool itself  
+- A new strategy to experiment with
+- Or "monitor" if there's nothing good to do right now
+
+Consider:
+1. Are there any bounties/jobs that match skills?
+2. What's the ROI of each potential action?
+3. Is this the right time to act?
+
+Be creative and think long-term. Write a detailed recommendation."""
+)
+
+
 class BrowserOracle:
     """Oracle that uses browser automation to discover opportunities"""
 
+    # A bare action name, possibly wrapped in quotes/backticks/punctuation
+    _VALID_RE = re.compile(
+        r"\W*(nostr_post|blog_improve|email_outreach|browser_discover|monitor)\W*",
+        re.IGNORECASE,
+    )
+
     def __init__(self, config: Config, llm):
         self.config = config
         self.llm = llm
@@ -388,184 +1015,132 @@ class BrowserOracle:
 
     def ask(self, context: dict, history: list = None) -> str:
         """Ask for strategic advice using oracle CLI with browser engine"""
-        import subprocess
-        import time
-        import json
-
         start = time.time()
 
         if not self.is_available():
             logger.warning("Browser Oracle not available")
             return ""
 
+        # Start a dedicated Chrome for Oracle on a random high port to avoid conflicts.
+        # It boots while browser discovery runs instead of after it.
+        # The oracle CLI runs through npx - without it, skip straight to the fallback.
+        oracle_port = "29347"  # Unique port for maxbitcoins
+        has_npx = shutil.which("npx") is not None
+        chrome_proc = self._start_chrome(oracle_port) if has_npx else None
+        chrome_start = time.time()
+
         logger.info("Using browser to discover opportunities...")
 
         # Discover opportunities via browser
-        opportunities = self.browser.discover_all()
+        try:
+            opportunities = self.browser.discover_all()
+        except BaseException:
+            self._stop_chrome(chrome_proc)
+            raise
         logger.info(
             f"Discovered {opportunities.get('total_found', 0)} opportunities in {time.time() - start:.1f}s"
         )
 
-        # First, use MiniMax to generate a detailed strategic prompt for Oracle
-        prompt_gen_start = time.time()
-        prompt_gen_system = """You are a prompt engineering expert. Your job is to create extremely detailed, useful prompts for a strategic AI assistant (GPT-5.2 Pro) that will analyze opportunities and make recommendations for an autonomous Bitcoin-earning agent."""
+        # Build strategic prompt for Oracle directly (the fallback reuses the same fields)
+        fields = self._prompt_fields(context, history, opportunities)
+        oracle_prompt = ORACLE_PROMPT.substitute(fields)
 
-        prompt_gen_user = f"""Current state of the MaxBitcoins autonomous agent:
-- Balance: {context.get("balance", 0)} sats
-- Today's revenue: {context.get("daily_revenue", 0)} sats
-- Last action: {context.get("last_action", "none")}
+        # Use oracle CLI with browser engine
+        oracle_start = time.time()
+        # Build oracle command with remote host if configured
+        cmd = [
+            "npx",
+            "-y",
+            "@steipete/oracle",
+            "--engine",
+            "browser",
+            "--model",
+            "gpt-5.2-pro",
+            "--force",  # Allow new session even if same prompt exists
+            "--prompt",
+            oracle_prompt,
+            "--file",
+            "brain/",
+            "--file",
+            "data/",
+            "--file",
+            "main.py",
+            "--file",
+            "Dockerfile",
+            "--file",
+            "requirements.txt",
+            "--file",
+            "infra/",
+        ]
 
-History (last 10 runs):
-{json.dumps(history[-10:] if history else [], indent=2)}
+        result = None
 
-Opportunities found:
-{json.dumps(opportunities, indent=2)}
+        try:
+            if not has_npx:
+                raise Exception("npx not found")
+            if chrome_proc is None:
+                raise Exception("Chrome failed to start")
 
-You have access to the full codebase (brain/, data/, main.py, Dockerfile, etc.) attached as files.
+            # Give Chrome its startup time, minus what discovery already took
+            remaining = CHROME_STARTUP_SECONDS - (time.time() - chrome_start)
+            time.sleep(max(0.0, remaining))
 
-Write a detailed strategic analysis (2-3 paragraphs) covering:
-1. Current situation analysis (balance, trends, patterns from history)
-2. What opportunities exist right now in the Lightning/Bitcoin ecosystem
-3. ROI analysis for each potential action
-4. Specific recommendations for how this agent can earn more Bitcoin
-5. Any new strategies, code changes, or ideas that haven't been tried
+            # Tell Oracle to use this Chrome
+            cmd.extend(["--browser-port", oracle_port])
 
-Then end with your final recommendation. This can be:
-- A specific action (e.g., "post to Nostr about X topic", "apply for Y bounty")
-- A code change to make to the tool itself
-- A new strategy to experiment with
-- Or "monitor" if there's nothing good to do right now
+            # Clean env for Oracle (clear remote host)
+            clean_env = os.environ.copy()
+            clean_env["ORACLE_REMOTE_HOST"] = ""
+            clean_env["ORACLE_REMOTE_TOKEN"] = ""
 
-IMPORTANT: Be creative and think long-term. Write as much detail as possible - this will be saved and learned from."""
+            # Timeout: 1 hour (oracle can take that long)
+            logger.info(f"Calling oracle with full codebase...")
 
-        # Build strategic prompt for Oracle directly
-        oracle_prompt = prompt_gen_user
+            result = subprocess.run(cmd, env=clean_env, **ORACLE_CLI_KWARGS)
 
-        # Use oracle CLI with browser engine
-        oracle_start = time.time()
-        try:
-            # Build oracle command with remote host if configured
-            cmd = [
-                "npx",
-                "-y",
-                "@steipete/oracle",
-                "--engine",
-                "browser",
-                "--model",
-                "gpt-5.2-pro",
-                "--force",  # Allow new session even if same prompt exists
-                "--prompt",
-                oracle_prompt,
-                "--file",
-                "brain/",
-                "--file",
-                "data/",
-                "--file",
-                "main.py",
-                "--file",
-                "Dockerfile",
-                "--file",
-                "requirements.txt",
-                "--file",
-                "infra/",
-            ]
-
-            # Start a dedicated Chrome for Oracle on port 9477
-            # Start a dedicated Chrome for Oracle on a random high port to avoid conflicts
-            oracle_port = "29347"  # Unique port for maxbitcoins
-            chrome_proc = None
-            result = None
-            
-            try:
-                logger.info(f"Starting Chrome on port {oracle_port}...")
-
-                # Start Chrome in background
-                chrome_proc = subprocess.Popen(
-                    [
-                        "chromium",
-                        f"--remote-debugging-port={oracle_port}",
-                        "--headless",
-                        "--no-sandbox",
-                    ],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-                time.sleep(3)
-
-                # Tell Oracle to use this Chrome
-                cmd.extend(["--browser-port", oracle_port])
-
-                # Clean env for Oracle (clear remote host)
-                clean_env = os.environ.copy()
-                clean_env["ORACLE_REMOTE_HOST"] = ""
-                clean_env["ORACLE_REMOTE_TOKEN"] = ""
-
-                # Timeout: 1 hour (oracle can take that long)
-                logger.info(f"Calling oracle with full codebase...")
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=3600,
-                    cwd="/home/klabo/maxbitcoins",
-                    env=clean_env,
+            logger.info(f"Oracle CLI completed in {time.time() - oracle_start:.1f}s")
+            logger.info(
+                f"Oracle stdout: {result.stdout[:2000] if result.stdout else 'empty'}"
+            )
+
+            # Check for errors
+            if "ECONNREFUSED" in result.stdout or "ECONNREFUSED" in result.stderr:
+                logger.warning(
+                    "Oracle browser mode failed (no Chrome), falling back to MiniMax"
                 )
+                raise Exception("Oracle browser not available")
 
-                logger.info(f"Oracle CLI completed in {time.time() - oracle_start:.1f}s")
+            # Extract full response and save to learnings
+            response = result.stdout
+            if response:
+                # Log the full strategic analysis
                 logger.info(
-                    f"Oracle stdout: {result.stdout[:2000] if result.stdout else 'empty'}"
+                    f"=== ORACLE STRATEGIC ANALYSIS ===\n{response}\n=== END ORACLE ANALYSIS ==="
                 )
 
-                # Check for errors
-                if "ECONNREFUSED" in result.stdout or "ECONNREFUSED" in result.stderr:
-                    logger.warning(
-                        "Oracle browser mode failed (no Chrome), falling back to MiniMax"
-                    )
-                    raise Exception("Oracle browser not available")
-
-                # Extract full response and save to learnings
-                response = result.stdout
-                if response:
-                    # Log the full strategic analysis
-                    logger.info(
-                        f"=== ORACLE STRATEGIC ANALYSIS ===\n{response}\n=== END ORACLE ANALYSIS ==="
+                # Also save to file for learning
+                try:
+                    oracle_file = ORACLE_HOME / "data" / "oracle_analysis.md"
+                    oracle_file.parent.mkdir(parents=True, exist_ok=True)
+                    oracle_file.write_text(
+                        f"# Oracle Strategic Analysis\n\n{response}\n"
                     )
+                except Exception as e:
+                    logger.error(f"Failed to save oracle analysis: {e}")
 
-                    # Also save to file for learning
-                    try:
-                        from pathlib import Path
-
-                        oracle_file = Path(
-                            "/home/klabo/maxbitcoins/data/oracle_analysis.md"
-                        )
-                        oracle_file.parent.mkdir(parents=True, exist_ok=True)
-                        oracle_file.write_text(
-                            f"# Oracle Strategic Analysis\n\n{response}\n"
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to save oracle analysis: {e}")
-
-                    return self._extract_recommendation(response)
-            except subprocess.TimeoutExpired:
-                logger.error("Oracle timed out after 1 hour")
-            except Exception as e:
-                logger.error(f"Oracle error: {e}")
-            finally:
-                # Cleanup Chrome process
-                if chrome_proc:
-                    try:
-                        chrome_proc.terminate()
-                        chrome_proc.wait(timeout=5)
-                        logger.info("Chrome process terminated")
-                    except:
-                        pass
+                return self._extract_recommendation(response)
+        except subprocess.TimeoutExpired:
+            logger.error("Oracle timed out after 1 hour")
+        except Exception as e:
+            logger.error(f"Oracle error: {e}")
+        finally:
+            self._stop_chrome(chrome_proc)
 
         # Fallback 1: Try MiniMax if oracle failed
         logger.info("Falling back to MiniMax...")
         try:
-            prompt = self._build_prompt(context, history, opportunities)
-            response = self.llm.generate(prompt, max_tokens=500)
+            prompt = FALLBACK_PROMPT.substitute(fields)
+            response = self.llm.generate(prompt, cacheable=True, intent="oracle_fallback")
             if response:
                 logger.info(f"MiniMax fallback response: {response[:200]}...")
                 return self._extract_recommendation(response)
@@ -575,39 +1150,43 @@ IMPORTANT: Be creative and think long-term. Write as much detail as possible - t
         # Final fallback
         return "browser_discover"
 
-    def _build_prompt(self, context: dict, history: list, opportunities: dict) -> str:
-        """Build prompt with discovered opportunities"""
-        import json
-
-        history_str = json.dumps(history[-10:] if history else [], indent=2)
-
-        return f"""You are MaxBitcoins Strategic Advisor. You have DISCOVERED real-time opportunities via browser:
-
-## Current State
-- Balance: {context.get("balance", 0)} sats
-- Today's revenue: {context.get("daily_revenue", 0)} sats
-
-## Recent History
-{history_str}
-
-## Discovered Opportunities
-{json.dumps(opportunities, indent=2)}
-
-## Your Task
-Analyze the discovered opportunities and recommend ONE action that has the highest potential for earning Bitcoin right now.
-
-Your recommendation can be:
-- A specific action (e.g., "post to Nostr about X topic", "apply for Y bounty")
-- A code change to make to the tool itself  
-- A new strategy to experiment with
-- Or "monitor" if there's nothing good to do right now
-
-Consider:
-1. Are there any bounties/jobs that match skills?
-2. What's the ROI of each potential action?
-3. Is this the right time to act?
+    def _start_chrome(self, port: str):
+        """Launch headless Chrome for Oracle in the background"""
+        logger.info(f"Starting Chrome on port {port}...")
+        try:
+            return subprocess.Popen(
+                [
+                    "chromium",
+                    f"--remote-debugging-port={port}",
+                    "--headless",
+                    "--no-sandbox",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except Exception as e:
+            logger.error(f"Failed to start Chrome: {e}")
+            return None
 
-Be creative and think long-term. Write a detailed recommendation."""
+    def _stop_chrome(self, chrome_proc):
+        """Cleanup Chrome process"""
+        if chrome_proc:
+            try:
+                chrome_proc.terminate()
+                chrome_proc.wait(timeout=5)
+                logger.info("Chrome process terminated")
+            except:
+                pass
+
+    def _prompt_fields(self, context: dict, history: list, opportunities: dict) -> dict:
+        """Values for ORACLE_PROMPT/FALLBACK_PROMPT, serialized once for both"""
+        return {
+            "balance": context.get("balance", 0),
+            "daily_revenue": context.get("daily_revenue", 0),
+            "last_action": context.get("last_action", "none"),
+            "history": jsonio.compact(_trim(history[-10:] if history else [])),
+            "opportunities": jsonio.compact(_trim_opportunities(opportunities)),
+        }
 
     def _extract_recommendation(self, response: str) -> str:
         """Extract recommendation from oracle response - now allows any response"""
@@ -617,13 +1196,11 @@ Be creative and think long-term. Write a detailed recommendation."""
         # Clean up response - remove any leading markers
         response = response.strip()
 
-        # If response is very short, return it as-is
+        # If response is very short, return it as-is (normalized if it names an action)
         if len(response) < 50:
-            return response
+            match = self._VALID_RE.fullmatch(response)
+            return match.group(1).lower() if match else response
 
         # Return full response for flexible action handling
         # The action_selector will parse this and decide what to do
         return response
-
-
-# Keep for backwards compatibility if needed
@@ -0,0 +1,126 @@
+"""
+Deterministic LLM response cache for MaxBitcoins
+Keys are SHA-256 hashes of the request, values live on disk with an in-process layer
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from brain import jsonio
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CACHE_DIR = DATA_DIR / "llm_cache"
+MAX_DISK_ENTRIES = 500
+PRUNE_EVERY = 50  # writes between disk prunes
+
+
+def cache_key(**parts) -> str:
+    """Hash the request parts (model, system, prompt, max_tokens, ...) into a cache key"""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class LLMCache:
+    """File-backed response cache with a bounded in-memory LRU in front"""
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR,
+        ttl: float = None,
+        max_memory: int = 128,
+        max_disk: int = MAX_DISK_ENTRIES,
+    ):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self._memory = OrderedDict()
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0}
+        self._prune()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def _expired(self, entry: dict) -> bool:
+        return self.ttl is not None and time.time() - entry.get("created_at", 0) > self.ttl
+
+    def _load(self, key: str) -> Optional[dict]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            entry = jsonio.loads(path.read_bytes())
+            os.utime(path)  # mtime doubles as last-used time for eviction
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key[:12]}: {e}")
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _prune(self):
+        """Delete the least recently used files beyond max_disk"""
+        try:
+            files = sorted(
+                self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime
+            )
+            for path in files[: max(0, len(files) - self.max_disk)]:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Cache prune failed: {e}")
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on miss"""
+        entry = self._load(key)
+        if entry is None or self._expired(entry):
+            self.stats["misses"] += 1
+            logger.info(f"LLM cache miss {key[:12]} ({self.describe()})")
+            return None
+
+        self.stats["hits"] += 1
+        logger.info(f"LLM cache hit {key[:12]} ({self.describe()})")
+        return entry.get("value")
+
+    def set(self, key: str, value):
+        """Store value under key (atomic write)"""
+        entry = {"created_at": time.time(), "value": value}
+        self._remember(key, entry)
+
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(jsonio.encode(entry))
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.error(f"Failed to write cache entry {key[:12]}: {e}")
+            return
+
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self._prune()
+
+    def describe(self) -> str:
+        """Human-readable hit/miss summary"""
+        total = self.stats["hits"] + self.stats["misses"]
+        rate = self.stats["hits"] / total if total else 0.0
+        return f"hits={self.stats['hits']} misses={self.stats['misses']} rate={rate:.0%}"
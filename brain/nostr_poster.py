@@ -4,19 +4,61 @@ SAFETY: Auto-posting is DISABLED by default. Set NOSTR_ENABLED=true to enable.
 """
 
 import asyncio
-import json
+import atexit
 import os
+import random
 import logging
-from datetime import datetime
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import cache
 from pathlib import Path
-from typing import Optional
 
+from brain import jsonio
 from brain.config import Config
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 RELAYS = ["wss://relay.damus.io", "wss://nos.lol", "wss://relay.primal.net"]
+POST_TIMEOUT = 30  # seconds to wait for a publish before giving up
+# First keyword found in a run result picks the notification emoji
+STATUS_EMOJI = (("failed", "🔴"), ("earning", "⚡"), ("monitor", "⚡"))
+NOTIFY_DEDUP_SECONDS = 300  # identical notifications inside this window are dropped
+
+# Curated notes for generate_content
+FACTS = (
+    "Your LN node earns ~1% APR on inbound liquidity. 1M sats = ~10k sats/year passive.",
+    "Most LN nodes have 0 channels. The top 10% control 90% of liquidity. Be in the top 10%.",
+    "Myth: LN isn't real Bitcoin. Reality: LN txs are Bitcoin txs with 2-of-2 multisig. Same security.",
+    "Tip: Don't close channels when fees spike. Wait for fee drops. Saved 50% last cycle.",
+    "A single LN node routed $1M in a day. Not whales - just a well-connected node.",
+    "LN has 15K+ nodes now. Growth 10x since 2021. This is adoption.",
+    "Zebedee LP earns 4% APY on sats in games. Risk: counterparty. Return: better than TradFi.",
+    "The average LN payment is ~$12. Coffee money at scale. That's the point.",
+    "Running a node costs ~$5/month. Earn 10k sats/month routing = profit in 3 months.",
+    "LN can't rug you - worst case you wait for timeout. Your coins are always recoverable.",
+    "Phoenix Wallet auto-queues payments. You don't even know you're on Lightning.",
+    "LN invoices expire. Always request fresh invoice for big amounts. Old = lost funds.",
+    "Stacker News zaps go through LN. Earn sats for posting. Free money for Bitcoin content.",
+)
+
+
+@cache
+def _keys(nsec: str):
+    """Parse the secret key once per process"""
+    from nostr_sdk import Keys, SecretKey
+
+    return Keys(SecretKey.parse(nsec))
+
+
+@dataclass(slots=True)
+class NostrState:
+    """Daily posting counters persisted in nostr_state.json"""
+
+    posts_today: int = 0
+    last_post_date: int = 0  # UTC day index
+    failed_count: int = 0
 
 
 class NostrPoster:
@@ -26,6 +68,16 @@ class NostrPoster:
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         self._load_state()
 
+        # Relay connections are opened on the first post and reused after that,
+        # all on one long-lived event loop rather than a fresh asyncio.run per post
+        self._client = None
+        self._loop = None
+        self._last_notify = None
+        self._last_notify_at = 0.0
+        self._post_lock = threading.Lock()
+        atexit.register(self.close)
+        atexit.register(self.flush)
+
         self.enabled = os.getenv("NOSTR_ENABLED", "false").lower() == "true"
 
         if self.enabled and not self.config.nostr_private_key:
@@ -36,136 +88,60 @@ class NostrPoster:
             logger.info("Nostr posting disabled (set NOSTR_ENABLED=true to enable)")
 
     def _load_state(self):
+        self.state = NostrState()
         if self.state_file.exists():
             try:
-                self.state = json.loads(self.state_file.read_text())
-            except:
-                self.state = {"posts_today": 0, "last_post_date": "", "failed_count": 0}
-        else:
-            self.state = {"posts_today": 0, "last_post_date": "", "failed_count": 0}
+                data = jsonio.loads(self.state_file.read_bytes())
+                self.state = NostrState(
+                    **{k: v for k, v in data.items() if k in NostrState.__slots__}
+                )
+            except (ValueError, OSError, AttributeError) as e:
+                logger.warning(f"Resetting unreadable Nostr state: {e}")
+
+        self._dirty = False
+        self._saved = jsonio.encode(asdict(self.state))
 
     def _save_state(self):
-        self.state_file.write_text(json.dumps(self.state, indent=2))
+        """Write state if it changed (atomic rename, so a crash can't truncate it)"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        blob = jsonio.encode(asdict(self.state))
+        if blob == self._saved:
+            return  # marked dirty but the content matches what is on disk
+        tmp = self.state_file.with_suffix(".tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(self.state_file)
+        self._saved = blob
 
     def _reset_daily(self):
-        today = datetime.now().date().isoformat()
-        if self.state.get("last_post_date") != today:
-            self.state["posts_today"] = 0
-            self.state["last_post_date"] = today
-            self._save_state()
+        today = int(time.time()) // 86400  # UTC day index
+        if self.state.last_post_date != today:
+            self.state.posts_today = 0
+            self.state.last_post_date = today
+            self._dirty = True
 
     def can_post(self) -> bool:
         if not self.enabled:
             return False
         self._reset_daily()
-        return self.state.get("posts_today", 0) < 3
+        return self.state.posts_today < 3
 
     def get_failed_count(self) -> int:
-        return self.state.get("failed_count", 0)
+        return self.state.failed_count
 
     def record_post(self, success: bool):
         self._reset_daily()
         if success:
-            self.state["posts_today"] = self.state.get("posts_today", 0) + 1
-            self.state["failed_count"] = 0
+            self.state.posts_today += 1
+            self.state.failed_count = 0
         else:
-            self.state["failed_count"] = self.state.get("failed_count", 0) + 1
-        self._save_state()
-
-    def _get_public_key(self, nsec: str) -> Optional[str]:
-        """Get public key from nsec using nostr-sdk"""
-        try:
-            from nostr_sdk import SecretKey, Keys
-
-            sk = SecretKey.parse(nsec)
-            keys = Keys(sk)
-            return keys.public_key().to_hex()
-        except Exception as e:
-            logger.error(f"Failed to get public key: {e}")
-            return None
-
-    def _sign_event(self, event: dict, nsec: str) -> Optional[dict]:
-        """Sign event using nostr-sdk"""
-        try:
-            from nostr_sdk import Client, Keys, SecretKey, NostrSigner, EventBuilder
-
-            sk = SecretKey.parse(nsec)
-            keys = Keys(sk)
-            signer = NostrSigner.keys(keys)
-
-            client = Client(signer)
-
-            for relay in RELAYS:
-                try:
-                    asyncio.run(client.add_relay(relay))
-                except:
-                    pass
-
-            asyncio.run(client.connect())
-
-            pubkey = keys.public_key().to_hex()
-            event["pubkey"] = pubkey
-
-            serialized = json.dumps(
-                [0, pubkey, event["created_at"], event["tags"], event["content"]],
-                separators=(",", ":"),
-            )
-
-            import hashlib
-
-            event_id = hashlib.sha256(serialized.encode()).hex()
-            event["id"] = event_id
-
-            signed = asyncio.run(
-                client.sign_event_builder(EventBuilder.text_note(event["content"]))
-            )
-
-            asyncio.run(client.shutdown())
-
-            return {
-                "id": signed.id().to_hex(),
-                "pubkey": signed.pubkey().to_hex(),
-                "created_at": signed.created_at().timestamp(),
-                "kind": signed.kind().as_u16(),
-                "tags": [[t.tag(), t.content()] for t in signed.tags()]
-                if signed.tags()
-                else [],
-                "content": signed.content(),
-                "sig": signed.sig().to_hex(),
-            }
-
-        except Exception as e:
-            logger.error(f"Failed to sign event: {e}")
-            return None
-
-    async def _publish_to_relay(self, relay: str, event: dict) -> bool:
-        """Publish event to a single relay"""
-        import websockets
-
-        try:
-            async with websockets.connect(relay, ping_interval=None) as ws:
-                await ws.send(json.dumps(["EVENT", event]))
+            self.state.failed_count += 1
+        self._dirty = True
 
-                try:
-                    response = await asyncio.wait_for(ws.recv(), timeout=10)
-                    response_data = json.loads(response)
-
-                    if response_data[0] == "OK":
-                        if response_data[2]:
-                            return True
-                        else:
-                            logger.warning(
-                                f"Relay {relay} rejected: {response_data[3]}"
-                            )
-                            return False
-                except asyncio.TimeoutError:
-                    return False
-
-        except Exception as e:
-            logger.error(f"Error connecting to {relay}: {e}")
-            return False
-
-        return False
+    def flush(self):
+        """Write pending counter changes to disk (end of run, and at exit)"""
+        self._save_state()
 
     async def post_note_async(self, content: str) -> bool:
         """Post a note to Nostr"""
@@ -179,73 +155,120 @@ class NostrPoster:
             return False
 
         try:
-            from nostr_sdk import SecretKey, Keys, Client, NostrSigner, EventBuilder
-
-            sk = SecretKey.parse(nsec)
-            keys = Keys(sk)
-            signer = NostrSigner.keys(keys)
+            from nostr_sdk import EventBuilder
 
-            client = Client(signer)
-
-            for relay in RELAYS:
-                try:
-                    await client.add_relay(relay)
-                except Exception as e:
-                    pass
-
-            await client.connect()
+            client = await self._relay_client(nsec)
 
             builder = EventBuilder.text_note(content)
-            await client.send_event_builder(builder)
-
-            await client.shutdown()
-
-            logger.info(f"Posted to Nostr: {content[:50]}...")
+            try:
+                output = await client.send_event_builder(builder)
+            except Exception:
+                await self._drop_client()
+                raise
+
+            for relay, error in (output.failed or {}).items():
+                logger.warning(f"Relay {relay} rejected note: {error}")
+            if not output.success:
+                # Reconnect from scratch next time rather than reuse dead sockets
+                await self._drop_client()
+                logger.error("No relay accepted the note")
+                return False
+
+            logger.info(
+                f"Posted to Nostr ({len(output.success)}/{len(RELAYS)} relays): "
+                f"{content[:50]}..."
+            )
             return True
 
         except Exception as e:
             logger.error(f"Error posting to Nostr: {e}")
             return False
 
+    async def _relay_client(self, nsec: str):
+        """Connected client, kept open so later posts skip the relay handshakes"""
+        if self._client is not None:
+            return self._client
+
+        from nostr_sdk import Client, NostrSigner
+
+        client = Client(NostrSigner.keys(_keys(nsec)))
+
+        # Register every relay at once; a bad URL only drops that relay
+        await asyncio.gather(
+            *(client.add_relay(relay) for relay in RELAYS), return_exceptions=True
+        )
+
+        # connect() dials the relays concurrently and the send fans out to all of
+        # them, so the slowest relay bounds latency instead of the sum
+        await client.connect()
+        self._client = client
+        return client
+
+    async def _drop_client(self):
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                await client.shutdown()
+            except Exception as e:
+                logger.debug(f"Nostr client shutdown failed: {e}")
+
+    def _run(self, coro):
+        """Run a coroutine on the poster's event loop, started on first use"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._loop.run_forever, name="nostr-loop", daemon=True
+            ).start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=POST_TIMEOUT)
+        except Exception:
+            future.cancel()
+            raise
+
+    def close(self):
+        """Disconnect from the relays and stop the event loop"""
+        with self._post_lock:
+            if self._loop is None:
+                return
+            if self._client is not None:
+                try:
+                    self._run(self._drop_client())
+                except Exception as e:
+                    logger.debug(f"Nostr client shutdown failed: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
     def post_note(self, content: str) -> bool:
         """Sync wrapper for post_note_async"""
         try:
-            return asyncio.run(self.post_note_async(content))
+            # One post at a time: the action worker and the run notification share
+            # the relay client
+            with self._post_lock:
+                return self._run(self.post_note_async(content))
         except Exception as e:
             logger.error(f"Error posting to Nostr: {e}")
             return False
 
     def generate_content(self, llm) -> str:
         """Generate content - curated facts (LLM-free for better quality)"""
-
-        import random
-
-        facts = [
-            "Your LN node earns ~1% APR on inbound liquidity. 1M sats = ~10k sats/year passive.",
-            "Most LN nodes have 0 channels. The top 10% control 90% of liquidity. Be in the top 10%.",
-            "Myth: LN isn't real Bitcoin. Reality: LN txs are Bitcoin txs with 2-of-2 multisig. Same security.",
-            "Tip: Don't close channels when fees spike. Wait for fee drops. Saved 50% last cycle.",
-            "A single LN node routed $1M in a day. Not whales - just a well-connected node.",
-            "LN has 15K+ nodes now. Growth 10x since 2021. This is adoption.",
-            "Zebedee LP earns 4% APY on sats in games. Risk: counterparty. Return: better than TradFi.",
-            "The average LN payment is ~$12. Coffee money at scale. That's the point.",
-            "Running a node costs ~$5/month. Earn 10k sats/month routing = profit in 3 months.",
-            "LN can't rug you - worst case you wait for timeout. Your coins are always recoverable.",
-            "Phoenix Wallet auto-queues payments. You don't even know you're on Lightning.",
-            "LN invoices expire. Always request fresh invoice for big amounts. Old = lost funds.",
-            "Stacker News zaps go through LN. Earn sats for posting. Free money for Bitcoin content.",
-        ]
-
-        return random.choice(facts)
+        return random.choice(FACTS)
 
     def notify(self, balance: int, action: str, result: str) -> bool:
         """Send run notification to Nostr"""
-        emoji = "🟢"
-        if "failed" in result.lower():
-            emoji = "🔴"
-        elif "earning" in result.lower() or "monitor" in result.lower():
-            emoji = "⚡"
+        lowered = result.lower()
+        emoji = next((e for word, e in STATUS_EMOJI if word in lowered), "🟢")
 
         content = f"{emoji} MaxBitcoins: {balance:,} sats | {action} | {result[:60]}"
 
-        return self.post_note(content)
+        # Don't publish the same status twice in a row within a short window
+        now = time.monotonic()
+        recent = now - self._last_notify_at < NOTIFY_DEDUP_SECONDS
+        if recent and content == self._last_notify:
+            logger.info("Skipping duplicate Nostr notification")
+            return True
+
+        posted = self.post_note(content)
+        if posted:
+            self._last_notify, self._last_notify_at = content, now
+        return posted
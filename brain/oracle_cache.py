@@ -0,0 +1,69 @@
+"""
+Oracle suggestion cache for MaxBitcoins
+Reuses recent advice when the agent's situation hasn't meaningfully changed
+"""
+
+import hashlib
+import json
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Optional
+
+from brain import jsonio
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def _log_bucket(value: int) -> int:
+    """Quantize sats onto a log scale so small drifts land in the same bucket"""
+    sign = -1 if value < 0 else 1
+    return sign * int(math.log1p(abs(value)) * 4)
+
+
+def context_signature(context: dict) -> str:
+    """Coarse fingerprint of a decision context"""
+    parts = {
+        "balance": _log_bucket(context.get("balance", 0)),
+        "daily_revenue": _log_bucket(context.get("daily_revenue", 0)),
+        "last_action": context.get("last_action", ""),
+        "failed_counts": context.get("failed_counts", {}),
+    }
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class OracleCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.file = DATA_DIR / "oracle_cache.json"
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load(self) -> dict:
+        if self.file.exists():
+            try:
+                return jsonio.loads(self.file.read_bytes())
+            except Exception as e:
+                logger.error(f"Error loading oracle cache: {e}")
+        return {}
+
+    def get(self, signature: str) -> Optional[str]:
+        """Cached suggestion for this signature, if still fresh"""
+        entry = self._load().get(signature)
+        if entry and time.time() - entry.get("created_at", 0) < self.ttl:
+            return entry.get("suggestion")
+        return None
+
+    def set(self, signature: str, suggestion: str):
+        """Remember a suggestion, dropping expired entries"""
+        now = time.time()
+        entries = {
+            sig: entry
+            for sig, entry in self._load().items()
+            if now - entry.get("created_at", 0) < self.ttl
+        }
+        entries[signature] = {"created_at": now, "suggestion": suggestion}
+        self.file.write_bytes(jsonio.encode(entries))
@@ -2,41 +2,104 @@
 Revenue tracking for MaxBitcoins
 """
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
-import requests
+from brain import jsonio
 from brain.config import Config
+from brain.http_client import new_session
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+_SESSION = new_session()
+
+
+MAX_HISTORY = 100
+COMPACT_LINES = 2 * MAX_HISTORY  # appended lines allowed before trimming back
+
 
 class RevenueTracker:
     def __init__(self, config: Config):
         self.config = config
-        self.history_file = DATA_DIR / "revenue_history.json"
+        # One JSON object per line so runs append instead of rewriting the file
+        self.history_file = DATA_DIR / "revenue_history.jsonl"
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        self._history_cache = (None, [])  # ((mtime_ns, size), entries)
+        self._migrate_legacy_history()
+
+    def _migrate_legacy_history(self):
+        """Convert the old single-array revenue_history.json to NDJSON"""
+        legacy = DATA_DIR / "revenue_history.json"
+        if self.history_file.exists() or not legacy.exists():
+            return
+        try:
+            self.save_history(jsonio.loads(legacy.read_bytes()))
+            logger.info("Migrated revenue history to NDJSON")
+        except Exception as e:
+            logger.error(f"Error migrating revenue history: {e}")
+
+    @staticmethod
+    def _parse_lines(lines) -> list:
+        entries = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(jsonio.loads(line))
+            except ValueError:
+                continue  # torn write from a crashed run
+        return entries
 
     def load_history(self) -> list:
-        """Load revenue history"""
-        if self.history_file.exists():
-            try:
-                return json.loads(self.history_file.read_text())
-            except:
-                return []
-        return []
+        """Load revenue history (re-parsed only when the file has changed)"""
+        try:
+            st = self.history_file.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self._history_cache[0] != stamp:
+                with open(self.history_file, "rb") as f:
+                    self._history_cache = (stamp, self._parse_lines(f)[-MAX_HISTORY:])
+        except OSError:
+            return []
+        return list(self._history_cache[1])
+
+    def load_recent(self, count: int) -> list:
+        """Load the last `count` entries by reading backwards from the end of the file"""
+        if count <= 0 or not self.history_file.exists():
+            return []
+        try:
+            with open(self.history_file, "rb") as f:
+                f.seek(0, 2)
+                end = f.tell()
+                pos = end
+                block = 256 * count
+                data = b""
+                # Need count + 1 newlines so the first line we keep is complete
+                while pos > 0 and data.count(b"\n") <= count:
+                    step = min(block, pos)
+                    pos -= step
+                    f.seek(pos)
+                    data = f.read(step) + data
+                    block *= 2
+            lines = data.split(b"\n")
+            if pos > 0:
+                lines = lines[1:]  # partial line at the seek boundary
+            return self._parse_lines(lines)[-count:]
+        except OSError:
+            return []
 
     def save_history(self, history: list):
         """Save revenue history"""
-        self.history_file.write_text(json.dumps(history, indent=2))
+        self.history_file.write_bytes(
+            b"".join(jsonio.encode(e) + b"\n" for e in history)
+        )
 
     def get_balance(self) -> int:
         """Get current LNbits balance"""
         try:
-            resp = requests.get(
+            resp = _SESSION.get(
                 f"{self.config.lnbits_url}/api/v1/wallet",
                 headers={"X-Api-Key": self.config.lnbits_key},
                 timeout=10,
@@ -55,38 +118,48 @@ class RevenueTracker:
         # For now, return 0 - we'll enhance this
         return 0
 
-    def record_run(self, balance: int, action: str = None, result: str = None):
-        """Record this run's revenue"""
-        history = self.load_history()
-
+    def record_run(
+        self, balance: int, action: str = None, result: str = None, *, ts: str = None
+    ):
+        """Record this run's revenue (ts lets callers share one timestamp)"""
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(timespec="seconds"),
             "balance": balance,
             "action": action or "",
             "result": result or "",
         }
 
-        history.append(entry)
+        with open(self.history_file, "ab") as f:
+            f.write(jsonio.encode(entry) + b"\n")
 
-        # Keep last 100 entries
-        history = history[-100:]
-
-        self.save_history(history)
+        # Trim back to the last MAX_HISTORY entries once twice that has piled up
+        # (counting newlines is cheap next to parsing and rewriting the file)
+        if self.history_file.read_bytes().count(b"\n") > COMPACT_LINES:
+            self.save_history(self.load_history())
         logger.info(
             f"Recorded run: balance={balance}, action={action}, result={result}"
         )
 
     def get_daily_revenue(self) -> int:
         """Calculate today's revenue"""
-        history = self.load_history()
-        today = datetime.now().date().isoformat()
-
-        today_entries = [e for e in history if e.get("timestamp", "").startswith(today)]
+        return self._daily_revenue(self.load_history())
 
-        if len(today_entries) >= 2:
-            return today_entries[-1].get("balance", 0) - today_entries[0].get(
-                "balance", 0
-            )
+    @staticmethod
+    def _daily_revenue(history: list) -> int:
+        """Balance change between today's first and last recorded runs"""
+        today = datetime.now().date().isoformat()
+        # Runs are appended in time order, so today's entries are a suffix -
+        # walk back from the end and stop at the first older one
+        first = last = None
+        for e in reversed(history):
+            if not e.get("timestamp", "").startswith(today):
+                break
+            if last is None:
+                last = e
+            first = e
+
+        if first is not last:
+            return last.get("balance", 0) - first.get("balance", 0)
         return 0
 
     def get_stats(self) -> dict:
@@ -104,6 +177,6 @@ class RevenueTracker:
             "current_balance": latest.get("balance", 0),
             "balance_at_start": first.get("balance", 0),
             "all_time_earnings": latest.get("balance", 0) - first.get("balance", 0),
-            "daily_revenue": self.get_daily_revenue(),
+            "daily_revenue": self._daily_revenue(history),
             "last_action": latest.get("action", ""),
         }
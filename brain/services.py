@@ -2,36 +2,40 @@
 Service health checks and management
 """
 import logging
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from brain.config import Config
+from brain.http_client import new_session
 
 logger = logging.getLogger(__name__)
 
+_SESSION = new_session()
+
 
 class ServiceManager:
     def __init__(self, config: Config):
         self.config = config
     
     def check_maximumsats(self) -> dict:
-        """Check maximumsats.com endpoints"""
+        """Check maximumsats.com endpoints (in parallel)"""
         endpoints = [
             ("https://maximumsats.com/wot", "WoT API"),
             ("https://maximumsats.com/api/dvm", "DVM"),
             ("https://maximumsats.com/mcp", "MCP"),
         ]
         
-        results = {}
-        for url, name in endpoints:
-            try:
-                resp = requests.get(url, timeout=10, allow_redirects=True)
-                results[name] = {
-                    "status": "up" if resp.status_code < 500 else "down",
-                    "code": resp.status_code,
-                }
-            except Exception as e:
-                results[name] = {"status": "error", "error": str(e)}
-        
-        return results
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+            statuses = pool.map(self._check_endpoint, [url for url, _ in endpoints])
+            return {name: status for (_, name), status in zip(endpoints, statuses)}
+    
+    def _check_endpoint(self, url: str) -> dict:
+        try:
+            resp = _SESSION.get(url, timeout=10, allow_redirects=True)
+            return {
+                "status": "up" if resp.status_code < 500 else "down",
+                "code": resp.status_code,
+            }
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
     
     def get_wot_revenue(self) -> int:
         """Get WoT API revenue from logs (approximation)"""
@@ -3,16 +3,20 @@ Strategic learnings storage for MaxBitcoins
 Stores insights from Oracle decisions to improve over time
 """
 
-import json
 import logging
 from pathlib import Path
 from datetime import datetime
+from brain import jsonio
 from brain.config import Config
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
-LEARNINGS_FILE = DATA_DIR / "strategic_learnings.json"
+# One JSON object per line so new learnings append instead of rewriting the file
+LEARNINGS_FILE = DATA_DIR / "strategic_learnings.jsonl"
+
+MAX_LEARNINGS = 50
+COMPACT_LINES = 2 * MAX_LEARNINGS  # appended lines allowed before trimming back
 
 
 class StrategicLearnings:
@@ -20,37 +24,65 @@ class StrategicLearnings:
         self.config = config
         self.file = LEARNINGS_FILE
         self.file.parent.mkdir(parents=True, exist_ok=True)
+        self._cache = (None, [])  # ((mtime_ns, size), learnings)
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """Convert the old single-array strategic_learnings.json to NDJSON"""
+        legacy = DATA_DIR / "strategic_learnings.json"
+        if self.file.exists() or not legacy.exists():
+            return
+        try:
+            self.save(jsonio.loads(legacy.read_bytes()))
+            logger.info("Migrated strategic learnings to NDJSON")
+        except Exception as e:
+            logger.error(f"Error migrating learnings: {e}")
 
     def load(self) -> list:
-        """Load all learnings"""
-        if self.file.exists():
-            try:
-                return json.loads(self.file.read_text())
-            except Exception as e:
-                logger.error(f"Error loading learnings: {e}")
-                return []
-        return []
+        """Load all learnings (re-parsed only when the file has changed)"""
+        try:
+            st = self.file.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self._cache[0] != stamp:
+                self._cache = (stamp, self._read()[-MAX_LEARNINGS:])
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.error(f"Error loading learnings: {e}")
+            return []
+        return list(self._cache[1])
+
+    def _read(self) -> list:
+        learnings = []
+        with open(self.file, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    learnings.append(jsonio.loads(line))
+                except ValueError:
+                    continue  # torn write from a crashed run
+        return learnings
 
     def save(self, learnings: list):
         """Save learnings"""
-        self.file.write_text(json.dumps(learnings, indent=2))
-
-    def add(self, learning: str, context: str = None):
-        """Add a new learning"""
-        learnings = self.load()
+        self.file.write_bytes(b"".join(jsonio.encode(e) + b"\n" for e in learnings))
 
+    def add(self, learning: str, context: str = None, *, ts: str = None):
+        """Add a new learning (ts lets callers share one timestamp)"""
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(timespec="seconds"),
             "learning": learning,
             "context": context or "",
         }
 
-        learnings.append(entry)
-
-        # Keep last 50 learnings
-        learnings = learnings[-50:]
+        with open(self.file, "ab") as f:
+            f.write(jsonio.encode(entry) + b"\n")
 
-        self.save(learnings)
+        # Trim back to the last MAX_LEARNINGS once twice that has piled up
+        # (counting newlines is cheap next to parsing and rewriting the file)
+        if self.file.read_bytes().count(b"\n") > COMPACT_LINES:
+            self.save(self.load())
         logger.info(f"Added learning: {learning[:100]}")
 
     def get_recent(self, count: int = 10) -> list:
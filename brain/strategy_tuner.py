@@ -0,0 +1,83 @@
+"""
+Strategy self-tuning for MaxBitcoins
+Tracks revenue per run under each action strategy and picks the winner
+"""
+
+import logging
+import random
+from pathlib import Path
+from brain import jsonio
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+ALPHA = 0.1  # EMA smoothing
+EPSILON = 0.1  # exploration rate once warmed up
+MIN_TRIALS = 3  # runs per strategy before exploiting
+NOISE_SATS = 1.0  # differences below this count as a tie
+
+
+class StrategyTuner:
+    """Epsilon-greedy choice between strategies based on an EMA of sats earned per run.
+
+    Ties go to the first (cheapest) strategy, so the LLM-backed one only
+    wins when it actually earns more.
+    """
+
+    def __init__(self, strategies: list):
+        self.strategies = strategies
+        self.state_file = DATA_DIR / "strategy_stats.json"
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            self.state = jsonio.loads(self.state_file.read_bytes())
+        except Exception:
+            self.state = {}
+        stats = self.state.setdefault("stats", {})
+        for name in self.strategies:
+            stats.setdefault(name, {"mean": 0.0, "runs": 0})
+        self.state.setdefault("last", None)
+
+    def _save_state(self):
+        self.state_file.write_bytes(jsonio.encode(self.state))
+
+    def credit(self, balance: int):
+        """Attribute the balance change since the last choice to that strategy"""
+        last = self.state.get("last")
+        if not last:
+            return
+        stats = self.state["stats"].get(last["strategy"])
+        if stats is not None:
+            delta = balance - last["balance"]
+            if stats["runs"] == 0:
+                stats["mean"] = float(delta)
+            else:
+                stats["mean"] += ALPHA * (delta - stats["mean"])
+            stats["runs"] += 1
+            logger.info(
+                f"Strategy {last['strategy']} earned {delta} sats (ema={stats['mean']:.1f})"
+            )
+        self.state["last"] = None
+        self._save_state()
+
+    def choose(self, balance: int) -> str:
+        """Pick the strategy for this run"""
+        stats = self.state["stats"]
+        untried = [n for n in self.strategies if stats[n]["runs"] < MIN_TRIALS]
+        if untried:
+            choice = min(untried, key=lambda n: stats[n]["runs"])
+        elif random.random() < EPSILON:
+            choice = random.choice(self.strategies)
+        else:
+            choice = self.strategies[0]
+            for name in self.strategies[1:]:
+                if stats[name]["mean"] > stats[choice]["mean"] + NOISE_SATS:
+                    choice = name
+
+        self.state["last"] = {"strategy": choice, "balance": balance}
+        self._save_state()
+        logger.info(f"Auto strategy picked: {choice}")
+        return choice
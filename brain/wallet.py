@@ -2,11 +2,14 @@
 LNbits wallet wrapper
 """
 import logging
-import requests
+import time
 from brain.config import Config
+from brain.http_client import new_session
 
 logger = logging.getLogger(__name__)
 
+BALANCE_TTL = 2.0  # seconds a fetched balance is reused within one run step
+
 
 class Wallet:
     def __init__(self, config: Config):
@@ -14,15 +17,28 @@ class Wallet:
         self.url = config.lnbits_url
         self.key = config.lnbits_key
         self.headers = {"X-Api-Key": self.key}
+        # One keep-alive connection to LNbits for balance checks, invoices and payments
+        self.session = new_session()
+        self.session.headers.update(self.headers)
+        self._balance_cache = (None, 0.0)  # (sats, monotonic time fetched)
+    
+    def invalidate_balance(self):
+        """Forget the cached balance so the next get_balance asks LNbits"""
+        self._balance_cache = (None, 0.0)
     
     def get_balance(self) -> int:
-        """Get wallet balance in sats"""
+        """Get wallet balance in sats (reused for a couple of seconds)"""
+        value, fetched_at = self._balance_cache
+        if value is not None and time.monotonic() - fetched_at < BALANCE_TTL:
+            return value
         try:
-            resp = requests.get(f"{self.url}/api/v1/wallet", headers=self.headers, timeout=10)
+            resp = self.session.get(f"{self.url}/api/v1/wallet", timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 # Balance is in msats, convert to sats
-                return data.get("balance", 0) // 1000
+                balance = data.get("balance", 0) // 1000
+                self._balance_cache = (balance, time.monotonic())
+                return balance
             logger.warning(f"Failed to get balance: {resp.status_code}")
             return 0
         except Exception as e:
@@ -32,9 +48,8 @@ class Wallet:
     def create_invoice(self, amount_sats: int, memo: str = "") -> dict:
         """Create a Lightning invoice"""
         try:
-            resp = requests.post(
+            resp = self.session.post(
                 f"{self.url}/api/v1/payments",
-                headers=self.headers,
                 json={
                     "out": False,
                     "amount": amount_sats * 1000,  # msats
@@ -44,6 +59,7 @@ class Wallet:
             )
             if resp.status_code == 200:
                 data = resp.json()
+                self.invalidate_balance()
                 return {
                     "payment_hash": data.get("payment_hash"),
                     "payment_request": data.get("payment_request"),
@@ -57,9 +73,8 @@ class Wallet:
     def pay_invoice(self, invoice: str) -> dict:
         """Pay a Lightning invoice"""
         try:
-            resp = requests.post(
+            resp = self.session.post(
                 f"{self.url}/api/v1/payments",
-                headers=self.headers,
                 json={
                     "out": True,
                     "bolt11": invoice,
@@ -68,6 +83,7 @@ class Wallet:
             )
             if resp.status_code == 200:
                 data = resp.json()
+                self.invalidate_balance()
                 return {
                     "success": True,
                     "payment_hash": data.get("payment_hash"),
@@ -85,9 +101,8 @@ class Wallet:
             if since_timestamp:
                 params["since"] = since_timestamp
             
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.url}/api/v1/payments",
-                headers=self.headers,
                 params=params,
                 timeout=10
             )
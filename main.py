@@ -46,6 +46,9 @@ def main():
     try:
         result = agent.run()
         
+        # Let the scheduled action finish and record its outcome
+        agent.drain()
+        
         # Check final balance
         final_balance = wallet.get_balance()
         earned = final_balance - balance